@@ -0,0 +1,259 @@
+"""Page-view and click analytics, buffered in memory and written to SQLite in batches.
+
+    python analytics.py              # views and clicks over the last 30 days
+    python analytics.py --days 7 --db path/to/analytics.sqlite3
+
+Recording an event on the render path is one deque append: no lock, no I/O.
+start() runs one writer thread per process. It drains the buffer every
+FLUSH_INTERVAL seconds, or as soon as BATCH_SIZE events are waiting, and
+inserts the whole batch in one transaction into a SQLite database in WAL
+mode, so the report can read while the app writes. If the writer falls
+behind by MAX_BUFFERED events, the oldest are dropped rather than growing
+memory. What is still buffered at exit is flushed by an atexit hook.
+
+Clicks happen in the browser. A tracker component (mount_tracker) collects
+clicks on elements with a data-track attribute (the CTA buttons, social
+links). Links inside the projects grid are tracked through the one
+data-track-cards attribute on the grid instead, as "project:<id>" or
+"related:<id>" derived from the card's data-id and the link's href. It sends
+them in batches, at most one rerun per CLICK_FLUSH_MS, and also when the
+page is hidden. The static export carries the same attributes but records
+nothing.
+
+Analytics are on by default; PORTFOLIO_ANALYTICS=0 turns them off. The app
+shows the report at ?stats=<key> when PORTFOLIO_ANALYTICS_KEY is set.
+"""
+import argparse
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ANALYTICS_PATH = os.environ.get("PORTFOLIO_ANALYTICS_DB", os.path.join(ROOT, ".cache", "analytics.sqlite3"))
+ENABLED = os.environ.get("PORTFOLIO_ANALYTICS", "1") not in ("", "0")
+REPORT_KEY = os.environ.get("PORTFOLIO_ANALYTICS_KEY")
+
+# Seconds between flushes, and the backlog that triggers one early
+FLUSH_INTERVAL = 2.0
+BATCH_SIZE = 500
+MAX_BUFFERED = 100_000
+
+COMPONENT_NAME = "click_tracker"
+CLICK_FLUSH_MS = 5000
+# Per batch from one browser, and per target, so a client cannot flood the table
+MAX_CLICKS = 50
+MAX_TARGET = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    session TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+"""
+
+INSERT = "INSERT INTO events (ts, kind, target, session) VALUES (?, ?, ?, ?)"
+
+ReportRow = namedtuple("ReportRow", ["kind", "target", "events", "sessions"])
+
+_buffer = deque(maxlen=MAX_BUFFERED)
+_wake = threading.Event()
+
+
+def record(kind, target, session=None):
+    """Buffer one event ("view", "click", ...) for the writer thread."""
+    if ENABLED:
+        _buffer.append((time.time(), kind, target, session))
+        if len(_buffer) >= BATCH_SIZE:
+            _wake.set()
+
+
+def session_id():
+    """The current Streamlit session's id ("bare" outside a session)."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "bare"
+
+
+def record_clicks(targets, session=None):
+    """Buffer a batch of clicks reported by the tracker component."""
+    if not isinstance(targets, list):
+        return
+    for target in targets[:MAX_CLICKS]:
+        if isinstance(target, str) and target:
+            record("click", target[:MAX_TARGET], session)
+
+
+def connect(path=ANALYTICS_PATH):
+    """Open the analytics database, creating it in WAL mode on first use."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def flush(conn):
+    """Write everything buffered so far in one transaction; returns the number of events."""
+    batch = []
+    try:
+        while True:
+            batch.append(_buffer.popleft())
+    except IndexError:
+        pass
+    if batch:
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(INSERT, batch)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            _buffer.extendleft(reversed(batch))
+            raise
+    return len(batch)
+
+
+def report(conn, since):
+    """Events and distinct sessions per (kind, target) since the `since` timestamp."""
+    rows = conn.execute(
+        "SELECT kind, target, COUNT(*), COUNT(DISTINCT session) FROM events WHERE ts >= ?"
+        " GROUP BY kind, target ORDER BY kind DESC, COUNT(*) DESC, target",
+        (since,),
+    )
+    return [ReportRow(*row) for row in rows]
+
+
+def daily_views(conn, since):
+    """[(YYYY-MM-DD, page views, sessions)] since the `since` timestamp."""
+    return conn.execute(
+        "SELECT date(ts, 'unixepoch'), COUNT(*), COUNT(DISTINCT session) FROM events"
+        " WHERE kind = 'view' AND ts >= ? GROUP BY 1 ORDER BY 1",
+        (since,),
+    ).fetchall()
+
+
+_write_lock = threading.Lock()
+
+
+def _work(conn):
+    while True:
+        if _wake.wait(FLUSH_INTERVAL):
+            _wake.clear()
+        with _write_lock:
+            try:
+                flush(conn)
+            except sqlite3.Error:  # e.g. the database is locked; try again next round
+                pass
+
+
+def _flush_at_exit(conn):
+    with _write_lock:
+        flush(conn)
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start(path=ANALYTICS_PATH):
+    """Start the writer thread once per process; a no-op when analytics are off."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        conn = connect(path)
+        threading.Thread(target=_work, args=(conn,), name="analytics-writer", daemon=True).start()
+        atexit.register(_flush_at_exit, conn)
+        _started = True
+
+
+# Clicks are queued in the browser and sent as one trigger value, so a burst
+# of clicks costs one rerun. Capturing listeners see clicks on links that the
+# smooth-scrolling handler (project_filter.py) cancels. Card links carry no
+# attribute of their own, which keeps the grid small.
+TRACKER_JS = """
+export default function(component) {
+    const {setTriggerValue} = component;
+    const [flushMs, maxClicks] = component.data;
+    let queue = [], timer = null;
+    const flush = () => {
+        clearTimeout(timer);
+        timer = null;
+        if (queue.length) setTriggerValue('clicks', queue.splice(0));
+    };
+    const cardTarget = link => {
+        const related = link.classList.contains('related-link') && /^#project-(.+)/.exec(link.getAttribute('href'));
+        if (related) return 'related:' + related[1];
+        const card = link.closest('[data-id]');
+        return card && 'project:' + card.dataset.id;
+    };
+    const onClick = event => {
+        const element = event.target.closest && event.target.closest('[data-track], [data-track-cards] a');
+        const target = element && (element.dataset.track || cardTarget(element));
+        if (!target) return;
+        queue.push(target);
+        if (queue.length >= maxClicks) flush();
+        else if (!timer) timer = setTimeout(flush, flushMs);
+    };
+    const onHide = () => {
+        if (document.visibilityState === 'hidden') flush();
+    };
+    document.addEventListener('click', onClick, true);
+    document.addEventListener('visibilitychange', onHide);
+    return () => {
+        flush();
+        document.removeEventListener('click', onClick, true);
+        document.removeEventListener('visibilitychange', onHide);
+    };
+}
+"""
+
+_component = None
+
+
+def mount_tracker(key="click_tracker"):
+    """Mount the click tracker; returns the clicks it reported on this rerun (a list, or None)."""
+    global _component
+    if not ENABLED:
+        return None
+    if _component is None:
+        import streamlit as st
+
+        _component = st.components.v2.component(COMPONENT_NAME, html="", js=TRACKER_JS)
+    # A list rather than a dict, for the same reason as project_filter.payload()
+    result = _component(key=key, data=[CLICK_FLUSH_MS, MAX_CLICKS], on_clicks_change=lambda: None)
+    return result.clicks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=30, help="report window in days (default: 30)")
+    parser.add_argument("--db", default=ANALYTICS_PATH, help="analytics database (default: .cache/analytics.sqlite3)")
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+    since = time.time() - args.days * 86400
+    rows = report(conn, since)
+    if not rows:
+        print(f"No events in the last {args.days:g} days")
+        return
+    print(f"Last {args.days:g} days:")
+    for day, views, sessions in daily_views(conn, since):
+        print(f"  {day}  {views:6d} views  {sessions:6d} sessions")
+    width = max(len(row.target) for row in rows)
+    for row in rows:
+        print(f"  {row.kind:6s} {row.target:{width}s} {row.events:7d} events {row.sessions:6d} sessions")
+
+
+if __name__ == "__main__":
+    main()
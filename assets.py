@@ -0,0 +1,61 @@
+"""Content-fingerprinted asset URLs.
+
+Every file the page references is written under a name that embeds a hash of
+its bytes (portfolio.css -> portfolio.3f9a0c1b2d.css), so a URL never changes
+meaning and can be cached forever. The manifest, asset-manifest.json at the
+root of the output directory, maps logical names to those URLs; serve.py
+reads it to send `Cache-Control: immutable` for every fingerprinted file.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = "asset-manifest.json"
+HASH_LENGTH = 10
+
+
+def hashed_name(name, data):
+    """Return `name` with a content hash inserted before the extension."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+class AssetManifest:
+    """Logical asset names -> fingerprinted URLs for one output directory."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.urls = {}
+
+    def add(self, name, data):
+        """Write `data` under a fingerprinted version of `name` and return its URL."""
+        url = hashed_name(name, data)
+        path = os.path.join(self.out_dir, url)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        self.urls[name] = url
+        return url
+
+    def add_existing(self, url):
+        """Record a file that a build step already wrote under a content-derived name."""
+        self.urls[url] = url
+        return url
+
+    def url(self, name):
+        return self.urls.get(name, name)
+
+    def save(self):
+        with open(os.path.join(self.out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump({"assets": self.urls}, f, indent=2, sort_keys=True)
+
+
+def immutable_paths(root):
+    """URL paths under `root` that are fingerprinted and safe to cache forever."""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+            urls = json.load(f)["assets"].values()
+    except FileNotFoundError:
+        return frozenset()
+    return frozenset("/" + url for url in urls)
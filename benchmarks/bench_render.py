@@ -0,0 +1,198 @@
+"""Render benchmark for portfolio.py, run headlessly through Streamlit's AppTest.
+
+    python benchmarks/bench_render.py                     # compare with baseline.json
+    python benchmarks/bench_render.py --out results.json  # also save the results
+    python benchmarks/bench_render.py --update-baseline
+
+Every st.markdown call is timed and sized. The first run starts from empty
+caches (cold); the following runs are warm reruns. Results are written as
+JSON, compared with the stored baseline, and the script exits non-zero when
+a budget in baseline.json is exceeded.
+
+Measure the page as it ships: build the related-pieces matrix and the fonts
+first (python related.py, python fonts.py), which add the related strips to
+the cards and the font preloads to the critical CSS.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(os.path.dirname(HERE), "portfolio.py")
+BASELINE = os.path.join(HERE, "baseline.json")
+sys.path.insert(0, os.path.dirname(HERE))
+
+from loadgen import percentile, summarize  # noqa: E402
+
+# <link> preloads (fonts) lead the critical CSS block but do not name it
+FIRST_TAG = re.compile(r"<(?!link\b)([a-zA-Z][\w-]*)([^>]*)>")
+ATTR_ID = re.compile(r'(?<![\w-])id="([\w-]+)"')
+ATTR_CLASS = re.compile(r'(?<![\w-])class="([\w-]+)')
+
+
+def label(body):
+    """Name a markdown block after the id, first class or name of its first tag other than <link>."""
+    match = FIRST_TAG.search(body)
+    if not match:
+        return "text"
+    tag, attrs = match.groups()
+    for pattern in (ATTR_ID, ATTR_CLASS):
+        found = pattern.search(attrs)
+        if found:
+            return found.group(1)
+    return tag
+
+
+class MarkdownRecorder:
+    """Wraps st.markdown to record bytes and time per call for one run.
+
+    The time charged to a block covers the script work since the previous
+    block was emitted, i.e. what it took to produce and send this one. Module
+    imports and st.set_page_config are charged to a separate "startup" entry.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self._original = None
+        self._original_config = None
+        self._last = None
+
+    def __enter__(self):
+        self._original = streamlit.markdown
+        self._original_config = streamlit.set_page_config
+        self._last = time.perf_counter()
+
+        def set_page_config(*args, **kwargs):
+            result = self._original_config(*args, **kwargs)
+            now = time.perf_counter()
+            self.calls.append(("startup", 0, now - self._last))
+            self._last = now
+            return result
+
+        def markdown(body, *args, **kwargs):
+            result = self._original(body, *args, **kwargs)
+            now = time.perf_counter()
+            self.calls.append((label(body), len(body.encode("utf-8")), now - self._last))
+            self._last = now
+            return result
+
+        streamlit.markdown = markdown
+        streamlit.set_page_config = set_page_config
+        return self
+
+    def __exit__(self, *exc):
+        streamlit.markdown = self._original
+        streamlit.set_page_config = self._original_config
+
+    def sections(self):
+        """Return (name, bytes, seconds) per call, numbering repeated names."""
+        seen = {}
+        out = []
+        for name, nbytes, seconds in self.calls:
+            seen[name] = seen.get(name, 0) + 1
+            if seen[name] > 1:
+                name = f"{name}-{seen[name]}"
+            out.append((name, nbytes, seconds))
+        return out
+
+
+def run_once(timeout):
+    with MarkdownRecorder() as recorder:
+        start = time.perf_counter()
+        at = AppTest.from_file(APP, default_timeout=timeout).run()
+        elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"portfolio.py raised: {at.exception[0].value}")
+    return elapsed, recorder.sections()
+
+
+def benchmark(runs, timeout=30):
+    """Run the app `runs` + 1 times (one cold, the rest warm) and summarize."""
+    streamlit.cache_resource.clear()
+    streamlit.cache_data.clear()
+    cold, cold_sections = run_once(timeout)
+    warm = []
+    per_section = {name: [] for name, _, _ in cold_sections}
+    sizes = {name: nbytes for name, nbytes, _ in cold_sections}
+    for _ in range(runs):
+        elapsed, sections = run_once(timeout)
+        warm.append(elapsed)
+        for name, nbytes, seconds in sections:
+            per_section.setdefault(name, []).append(seconds)
+            sizes[name] = nbytes
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "runs": runs,
+        "rerun_ms": dict(cold=ms(cold), **summarize(warm)),
+        "markdown_calls": sum(1 for name in sizes if name != "startup"),
+        "total_bytes": sum(sizes.values()),
+        "sections": [
+            {"name": name, "bytes": sizes[name], "ms_p50": ms(percentile(times, 50))}
+            for name, times in per_section.items() if times
+        ],
+    }
+
+
+def check(results, baseline):
+    """Return budget violations and the deltas against the baseline results."""
+    budgets = baseline.get("budgets", {})
+    previous = baseline.get("results")
+    failures = []
+    if "total_bytes" in budgets and results["total_bytes"] > budgets["total_bytes"]:
+        failures.append(f"total_bytes {results['total_bytes']} > budget {budgets['total_bytes']}")
+    for key, limit in budgets.get("rerun_ms", {}).items():
+        if results["rerun_ms"][key] > limit:
+            failures.append(f"rerun_ms.{key} {results['rerun_ms'][key]} > budget {limit}")
+    for section in results["sections"]:
+        limit = budgets.get("section_bytes", {}).get(section["name"])
+        if limit is not None and section["bytes"] > limit:
+            failures.append(f"section {section['name']} {section['bytes']} bytes > budget {limit}")
+    deltas = {}
+    if previous:
+        deltas["total_bytes"] = results["total_bytes"] - previous["total_bytes"]
+        for key, value in results["rerun_ms"].items():
+            deltas[f"rerun_ms.{key}"] = round(value - previous["rerun_ms"].get(key, 0), 3)
+    return failures, deltas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="warm reruns to time (default: 20)")
+    parser.add_argument("--out", help="write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline and budgets file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.runs)
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    failures, deltas = check(results, baseline)
+    report = dict(results, deltas=deltas, failures=failures)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        baseline["results"] = results
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
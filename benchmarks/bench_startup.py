@@ -0,0 +1,167 @@
+"""Cold-start profile for portfolio.py, with budgets CI can enforce.
+
+    python benchmarks/bench_startup.py                 # compare with startup.json
+    python benchmarks/bench_startup.py --runs 10 --out startup-results.json
+    python benchmarks/bench_startup.py --update-baseline
+
+Every run is a fresh interpreter, so nothing is warm. The time is split into:
+importing Streamlit, script start (the script runner starting up plus the
+app's own module imports, i.e. everything before st.set_page_config),
+st.set_page_config itself, and the first render (the rest of the script,
+caches empty). The child runs under `-X importtime`, and the imports the app
+triggers are ranked by cumulative time. The script exits non-zero when a
+median exceeds its budget in startup.json or when a module on the
+"forbidden" list (e.g. Pillow, which is only needed to build images) was
+imported on the render path.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(os.path.dirname(HERE), "portfolio.py")
+BASELINE = os.path.join(HERE, "startup.json")
+
+# Written to stderr by the child so -X importtime lines can be attributed to the app
+MARKER = "# portfolio startup"
+
+PHASES = ("streamlit_import", "script_start", "set_page_config", "first_render", "total")
+
+
+def child():
+    """Profile one cold start in this process and print the timings as JSON."""
+    start = time.perf_counter()
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    marks = {}
+    original = streamlit.set_page_config
+
+    def set_page_config(*args, **kwargs):
+        marks["config_start"] = time.perf_counter()
+        result = original(*args, **kwargs)
+        marks["config_end"] = time.perf_counter()
+        return result
+
+    streamlit.set_page_config = set_page_config
+    before = set(sys.modules)
+    at = AppTest.from_file(APP, default_timeout=60)
+    sys.stderr.write(MARKER + "\n")
+    sys.stderr.flush()
+    run_start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    if at.exception:
+        raise SystemExit(f"portfolio.py raised: {at.exception[0].value}")
+    ms = lambda seconds: round(seconds * 1000, 3)
+    print(json.dumps({
+        "streamlit_import": ms(imported - start),
+        "script_start": ms(marks["config_start"] - run_start),
+        "set_page_config": ms(marks["config_end"] - marks["config_start"]),
+        "first_render": ms(end - marks["config_end"]),
+        "total": ms(end - start),
+        "modules": sorted({name.partition(".")[0] for name in set(sys.modules) - before}),
+    }))
+
+
+def parse_importtime(stderr):
+    """Top-level imports made after MARKER, as {module: cumulative microseconds}."""
+    _, _, lines = stderr.partition(MARKER)
+    imports = {}
+    for line in lines.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        # Nested imports are indented; keep what the app imported directly
+        if name.startswith("  "):
+            continue
+        imports[name.strip()] = int(fields[1])
+    return imports
+
+
+def run_once():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"],
+        capture_output=True, text=True, cwd=os.path.dirname(HERE),
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def profile(runs):
+    """Profile `runs` cold starts and summarize the medians."""
+    samples, imports = [], {}
+    for _ in range(runs):
+        timings, run_imports = run_once()
+        samples.append(timings)
+        for name, micros in run_imports.items():
+            imports.setdefault(name, []).append(micros)
+    top = sorted(((statistics.median(times), name) for name, times in imports.items()), reverse=True)[:15]
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "runs": runs,
+        "startup_ms": {phase: round(statistics.median(s[phase] for s in samples), 3) for phase in PHASES},
+        "slowest_app_imports_ms": {name: round(micros / 1000, 3) for micros, name in top},
+        "modules": sorted(set().union(*(s["modules"] for s in samples))),
+    }
+
+
+def check(results, baseline):
+    """Return budget violations for the median timings and forbidden imports."""
+    budgets = baseline.get("budgets", {})
+    failures = []
+    for phase, limit in budgets.get("startup_ms", {}).items():
+        if results["startup_ms"][phase] > limit:
+            failures.append(f"startup_ms.{phase} {results['startup_ms'][phase]} > budget {limit}")
+    for module in budgets.get("forbidden_modules", ()):
+        if module in results["modules"]:
+            failures.append(f"{module} imported during startup")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to profile (default: 5)")
+    parser.add_argument("--out", help="write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline and budgets file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child()
+        return 0
+
+    results = profile(args.runs)
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    failures = check(results, baseline)
+    report = dict(results, failures=failures)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        baseline["results"] = results
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
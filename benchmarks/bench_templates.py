@@ -0,0 +1,102 @@
+"""Page render time from the section templates, with budgets CI can enforce.
+
+    python benchmarks/bench_templates.py                # compare with templates.json
+    python benchmarks/bench_templates.py --iterations 5000 --out templates-results.json
+    python benchmarks/bench_templates.py --update-baseline
+
+The catalog (with its pre-rendered cards) is loaded once. The benchmark then
+times three things. The first is the first page render in a fresh
+Environment, where templates are loaded from the bytecode cache in
+.cache/templates when it is there. The second is re-rendering every card.
+The third is the full page from warm templates, i.e. sections.render_sections
+exactly as export.py and the app call it. The script exits non-zero when a
+percentile exceeds its budget in templates.json.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import templates  # noqa: E402
+from catalog import load_catalog, render_card  # noqa: E402
+from loadgen import summarize  # noqa: E402
+from sections import render_sections  # noqa: E402
+
+BASELINE = os.path.join(HERE, "templates.json")
+
+
+def profile(iterations):
+    """Time `iterations` warm page renders, after one first render in a fresh Environment."""
+    catalog = load_catalog()
+    templates.environment.cache_clear()
+    start = time.perf_counter()
+    sections = render_sections(catalog)
+    first = time.perf_counter() - start
+
+    card_samples, page_samples = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for project in catalog.projects:
+            render_card(project)
+        card_samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        render_sections(catalog)
+        page_samples.append(time.perf_counter() - start)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "projects": len(catalog.projects),
+        "page_bytes": sum(len(html) for _, html in sections),
+        "first_render_ms": round(first * 1000, 3),
+        "cards_us": summarize(card_samples, scale=1e6),
+        "page_us": summarize(page_samples, scale=1e6),
+    }
+
+
+def check(results, baseline):
+    """Return budget violations for the render percentiles."""
+    failures = []
+    for metric, limits in baseline.get("budgets", {}).items():
+        for stat, limit in limits.items():
+            if results[metric][stat] > limit:
+                failures.append(f"{metric}.{stat} {results[metric][stat]} > budget {limit}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="warm renders to time (default: 2000)")
+    parser.add_argument("--out", help="write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline and budgets file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = profile(args.iterations)
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    failures = check(results, baseline)
+    report = dict(results, failures=failures)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        baseline["results"] = results
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Concurrent-session load test for portfolio.py over Streamlit's websocket.
+
+    python benchmarks/load_sessions.py                      # 1, 8, 32 sessions
+    python benchmarks/load_sessions.py -n 64 128 --reruns 20
+    python benchmarks/load_sessions.py --url http://127.0.0.1:8501 -n 16
+
+Starts the app on a free local port (unless --url points at a running one)
+and opens N simulated browser sessions on /_stcore/stream, with no browser.
+Each session sends the BackMsg rerun request a browser sends and waits for
+the ScriptFinished ForwardMsg, so the time measured is time to full render:
+every delta of the page has arrived. All sessions start together and rerun
+back to back; the report gives reruns/second, p50/p95/p99 render time, and
+the server's resident memory per connected session (read from /proc, so only
+for a server this script started). Everything runs on localhost. Needs the
+websockets client from benchmarks/requirements.txt:
+
+    pip install -r benchmarks/requirements.txt
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+APP = os.path.join(ROOT, "portfolio.py")
+sys.path.insert(0, ROOT)
+
+from loadgen import summarize  # noqa: E402
+
+# ForwardMsg.ScriptFinishedStatus values that end a full run
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY,)
+FAILED = (ForwardMsg.FINISHED_WITH_COMPILE_ERROR,)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, timeout=60):
+    """Run portfolio.py headless on `port` and wait until it reports healthy."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("streamlit did not become healthy in time")
+
+
+def rss_bytes(pid):
+    """Resident set size of `pid` in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def rerun_request():
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    return msg.SerializeToString()
+
+
+async def wait_for_render(ws):
+    """Read ForwardMsgs until the script run finishes; returns (messages, bytes)."""
+    messages = nbytes = 0
+    while True:
+        data = await ws.recv()
+        messages += 1
+        nbytes += len(data)
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        if msg.WhichOneof("type") != "script_finished":
+            continue
+        if msg.script_finished in FAILED:
+            raise RuntimeError("portfolio.py failed to compile")
+        if msg.script_finished in FINISHED:
+            return messages, nbytes
+
+
+async def session(url, reruns, start, done, connected, results):
+    latencies, totals = results
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        connected.release()
+        await start.wait()
+        request = rerun_request()
+        for _ in range(reruns):
+            began = time.perf_counter()
+            await ws.send(request)
+            messages, nbytes = await wait_for_render(ws)
+            latencies.append(time.perf_counter() - began)
+            totals[0] += messages
+            totals[1] += nbytes
+        # Stay connected until every session is done, so memory is measured
+        # with all of them alive
+        await done.wait()
+
+
+async def run_level(url, sessions, reruns, pid):
+    """Drive `sessions` concurrent sessions for `reruns` renders each and summarize."""
+    idle_rss = rss_bytes(pid) if pid else None
+    start, done = asyncio.Event(), asyncio.Event()
+    connected = asyncio.Semaphore(0)
+    results = ([], [0, 0])
+    tasks = [asyncio.create_task(session(url, reruns, start, done, connected, results)) for _ in range(sessions)]
+    for _ in range(sessions):
+        await connected.acquire()
+    began = time.perf_counter()
+    start.set()
+    while len(results[0]) < sessions * reruns:
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            if task.done() and task.exception():
+                raise task.exception()
+    elapsed = time.perf_counter() - began
+    loaded_rss = rss_bytes(pid) if pid else None
+    done.set()
+    await asyncio.gather(*tasks)
+
+    latencies = results[0]
+    report = {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "seconds": round(elapsed, 3),
+        "reruns_per_second": round(len(latencies) / elapsed, 1),
+        "render_ms": summarize(latencies),
+        "messages_per_render": round(results[1][0] / len(latencies), 1),
+        "bytes_per_render": round(results[1][1] / len(latencies)),
+    }
+    if idle_rss is not None and loaded_rss is not None:
+        report["rss_mb"] = {
+            "idle": round(idle_rss / 2**20, 1),
+            "loaded": round(loaded_rss / 2**20, 1),
+            "per_session": round((loaded_rss - idle_rss) / sessions / 2**20, 3),
+        }
+    return report
+
+
+async def run(url, levels, reruns, pid):
+    # One throwaway session fills the process-wide caches, so the first level
+    # measures serving rather than the cold build
+    await run_level(url, 1, 1, None)
+    reports = []
+    for sessions in levels:
+        reports.append(await run_level(url, sessions, reruns, pid))
+        # Let the server drop the closed sessions before the next level
+        await asyncio.sleep(1)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--sessions", type=int, nargs="+", default=[1, 8, 32],
+                        help="concurrent session counts to test, in order (default: 1 8 32)")
+    parser.add_argument("--reruns", type=int, default=10, help="renders per session (default: 10)")
+    parser.add_argument("--url", help="use an already running app instead of starting one")
+    parser.add_argument("--out", help="also write the report JSON to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        base = args.url.rstrip("/")
+    else:
+        port = free_port()
+        process = start_server(port)
+        base = f"http://127.0.0.1:{port}"
+    ws_url = base.replace("http", "ws", 1) + "/_stcore/stream"
+    try:
+        levels = asyncio.run(run(ws_url, args.sessions, args.reruns, process.pid if process else None))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    report = {"url": base, "python": sys.version.split()[0], "levels": levels}
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Project catalog: structured project data, pre-rendered cards and a tag index.
+
+The catalog is loaded once from content/projects.json. Every card is rendered
+to HTML at load time and a tag -> project inverted index is built alongside.
+The index, keyed by card id, drives the client-side filter buttons: every
+card is sent to the browser once and a filter click only hides and shows
+them, which suits a portfolio-sized catalog better than paging on the server.
+"""
+import html
+import json
+import os
+from collections import namedtuple
+
+from markupsafe import Markup
+
+from templates import template
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", "projects.json")
+
+ALL = "All"
+
+Project = namedtuple("Project", ["id", "title", "summary", "tags", "image", "link_label", "link_url"])
+
+# Rendered card widths: full width on phones, two columns on tablets, three on desktop
+CARD_SIZES = "(max-width: 768px) 100vw, (max-width: 992px) 50vw, 400px"
+
+def render_card(project, images=None, related=()):
+    """Render one project card with assets/templates/card.html, escaping all catalog text.
+
+    `images` is an optional images.ImageManifest used for responsive markup,
+    `related` the Projects to link from the card's related-pieces strip.
+    """
+    if images is not None:
+        image = images.img_html(project.image, project.title, CARD_SIZES)
+    else:
+        e = html.escape
+        image = f'<img src="{e(project.image)}" alt="{e(project.title)}" loading="lazy" decoding="async">'
+    return template("card.html").render(project=project, image=Markup(image), related=related)
+
+
+class Catalog:
+    """Immutable in-memory catalog with pre-rendered cards and a tag index."""
+
+    __slots__ = ("projects", "filters", "cards", "tag_index", "filter_index")
+
+    def __init__(self, projects, filters, images=None, cards=None, related=None):
+        self.projects = tuple(projects)
+        self.filters = tuple(filters)
+        # `cards` lets a caller that memoizes render_card() pass them in pre-rendered
+        if cards is None:
+            by_id = {project.id: project for project in self.projects}
+            related = related or {}
+            cards = (
+                render_card(p, images, [by_id[other] for other in related.get(p.id, ()) if other in by_id])
+                for p in self.projects
+            )
+        self.cards = tuple(cards)
+        index = {}
+        for i, project in enumerate(self.projects):
+            for tag in project.tags:
+                index.setdefault(tag, []).append(i)
+        self.tag_index = {tag: tuple(ids) for tag, ids in index.items()}
+        # Filter label -> card data-ids, shipped to the browser as-is (see project_filter.py)
+        self.filter_index = {
+            label: [self.projects[i].id for i in self.ids(label)] for label in (ALL,) + self.filters
+        }
+
+    def __len__(self):
+        return len(self.projects)
+
+    def ids(self, tag=ALL):
+        """Indices of the projects carrying `tag`, or every project for "All"."""
+        if tag in (None, ALL):
+            return range(len(self.projects))
+        return self.tag_index.get(tag, ())
+
+    def cards_html(self, ids):
+        return "".join(self.cards[i] for i in ids)
+
+
+def read_projects(path=CATALOG_PATH):
+    """Parse the catalog JSON; returns (projects, filters)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    projects = tuple(
+        Project(
+            id=item["id"],
+            title=item["title"],
+            summary=item["summary"],
+            tags=tuple(item.get("tags", ())),
+            image=item["image"],
+            link_label=item.get("link_label", "View Project"),
+            link_url=item.get("link_url", "#"),
+        )
+        for item in data["projects"]
+    )
+    return projects, tuple(data.get("filters", ()))
+
+
+def load_catalog(path=CATALOG_PATH, images=None, related=None):
+    """Load the catalog JSON into a Catalog, rendering images through `images` if given.
+
+    `related` (see related.py) adds a related-pieces strip to each card.
+    """
+    projects, filters = read_projects(path)
+    return Catalog(projects, filters, images, related=related)
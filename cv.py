@@ -0,0 +1,211 @@
+"""Build-once CV: content/cv.json rendered to a small PDF.
+
+    python cv.py                 # writes static/cv/cv.<hash>.pdf for the app
+    python cv.py --out cv.pdf
+
+The PDF is written directly with the standard Helvetica fonts, so no PDF
+library is needed, and it contains no timestamps: the bytes depend only on
+cv.json, and the fingerprinted file name changes exactly when the data does.
+The app builds it once per process (see portfolio.get_cv) and links the file
+from the About section; export.py adds the same bytes to its asset manifest.
+"""
+import argparse
+import json
+import os
+import zlib
+
+from assets import AssetManifest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CV_PATH = os.path.join(ROOT, "content", "cv.json")
+STATIC_ROOT = os.path.join(ROOT, "static")
+# Logical asset name; AssetManifest writes it as cv/cv.<hash>.pdf
+ASSET_NAME = "cv/cv.pdf"
+
+# A4 in points
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 56
+
+FONTS = {"regular": b"F1", "bold": b"F2", "italic": b"F3"}
+BASE_FONTS = {b"F1": b"Helvetica", b"F2": b"Helvetica-Bold", b"F3": b"Helvetica-Oblique"}
+
+# The page palette: --primary, --secondary and --gray in the stylesheet
+PRIMARY = (0.173, 0.243, 0.314)
+SECONDARY = (0.204, 0.596, 0.859)
+GRAY = (0.45, 0.5, 0.51)
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard AFM
+_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+# Helvetica-Bold runs about 7% wider; close enough for line wrapping
+BOLD_FACTOR = 1.07
+
+
+def text_width(text, size, font="regular"):
+    units = sum(_WIDTHS[ord(c) - 32] if 32 <= ord(c) < 127 else 556 for c in text)
+    return units * size / 1000 * (BOLD_FACTOR if font == "bold" else 1)
+
+
+def wrap(text, size, width, font="regular"):
+    """Break `text` into lines no wider than `width` points."""
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and text_width(candidate, size, font) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _pdf_string(text):
+    data = text.encode("cp1252", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class _Pages:
+    """Top-down text layout onto as many pages as it takes."""
+
+    def __init__(self):
+        self.pages = []
+        self._new_page()
+
+    def _new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def space(self, points):
+        self.y -= points
+
+    def text(self, text, size, font="regular", color=PRIMARY, indent=0, leading=1.4):
+        """Write `text` wrapped to the text column, starting a new page when full."""
+        x = MARGIN + indent
+        for line in wrap(text, size, PAGE_WIDTH - MARGIN - x, font):
+            if self.y - size < MARGIN:
+                self._new_page()
+            self.y -= size * leading
+            self.ops.append(
+                b"BT /%s %.1f Tf %.3f %.3f %.3f rg %.1f %.1f Td %s Tj ET"
+                % (FONTS[font], size, *color, x, self.y, _pdf_string(line))
+            )
+
+    def bullet(self, text, size):
+        if self.y - size < MARGIN:
+            self._new_page()
+        self.ops.append(
+            b"BT /F1 %.1f Tf %.3f %.3f %.3f rg %.1f %.1f Td (\x95) Tj ET"
+            % (size, *SECONDARY, MARGIN + 4, self.y - size * 1.4)
+        )
+        self.text(text, size, indent=16)
+
+    def rule(self, color=SECONDARY):
+        self.y -= 8
+        self.ops.append(
+            b"%.3f %.3f %.3f RG 1 w %d %.1f m %d %.1f l S" % (*color, MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y)
+        )
+        self.y -= 6
+
+
+def _write_pdf(pages, title):
+    """Assemble the page content streams into a complete PDF file."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_id = add(None)
+    font_ids = {
+        name: add(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base)
+        for name, base in BASE_FONTS.items()
+    }
+    fonts = b" ".join(b"/%s %d 0 R" % (name, ref) for name, ref in font_ids.items())
+    kids = []
+    for ops in pages:
+        stream = zlib.compress(b"\n".join(ops), 9)
+        content = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources << /Font << %s >> >> /Contents %d 0 R >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, fonts, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids),
+    )
+    info = add(b"<< /Title %s /Producer (portfolio cv.py) >>" % _pdf_string(title))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, info, xref,
+    )
+    return bytes(out)
+
+
+def render_pdf(cv):
+    """Lay out the parsed cv.json data and return the PDF bytes."""
+    pages = _Pages()
+    pages.text(cv["name"], 24, "bold", leading=1.2)
+    pages.space(4)
+    pages.text(cv["headline"], 12.5, color=SECONDARY)
+    pages.text("  |  ".join(cv.get("contact", ())), 9.5, color=GRAY)
+    pages.rule()
+    pages.text(cv.get("summary", ""), 10.5, leading=1.5)
+    for section in cv.get("sections", ()):
+        pages.space(14)
+        pages.text(section["title"].upper(), 11.5, "bold", color=SECONDARY)
+        pages.rule(GRAY)
+        for entry in section["entries"]:
+            pages.text(entry["heading"], 11, "bold")
+            if entry.get("meta"):
+                pages.text(entry["meta"], 9.5, "italic", color=GRAY)
+            for point in entry.get("points", ()):
+                pages.bullet(point, 10.5)
+            pages.space(6)
+    return _write_pdf(pages.pages, f"{cv['name']} - CV")
+
+
+def build_cv(path=CV_PATH):
+    """Read cv.json and return the CV as PDF bytes."""
+    with open(path, encoding="utf-8") as f:
+        return render_pdf(json.load(f))
+
+
+def publish(pdf, root=STATIC_ROOT):
+    """Write `pdf` under a fingerprinted name below `root`; returns its relative URL."""
+    return AssetManifest(root).add(ASSET_NAME, pdf)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write the PDF to this file instead of static/cv/")
+    args = parser.parse_args(argv)
+    pdf = build_cv()
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(pdf)
+        path = args.out
+    else:
+        path = os.path.join(STATIC_ROOT, publish(pdf))
+    print(f"Wrote {path} ({len(pdf):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
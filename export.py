@@ -0,0 +1,188 @@
+"""Pre-render the portfolio into a self-contained static HTML bundle.
+
+    python export.py            # writes dist/index.html
+    python export.py --out site
+
+The bundle contains the same CSS and sections as the Streamlit app, plus the
+responsive variants of any local images (see images.py) and the vendored
+copies of third-party files (see vendor.py), so it can be served from any
+static file server without a Python process per visitor.
+"""
+import argparse
+import gzip
+import html
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are written
+    brotli = None
+
+import fonts
+import stylesheet
+from assets import AssetManifest
+from catalog import load_catalog
+from cv import ASSET_NAME as CV_ASSET, build_cv
+from icons import inline_icons
+from images import ImageManifest, build_images
+from project_filter import static_script
+from related import build_related
+from sections import ABOUT_IMAGE, FONT_AWESOME_URL, PAGE_ICON, PAGE_TITLE, render_sections
+from vendor import VendorManifest
+
+# Text assets get .gz (and .br when brotli is installed) siblings for serve.py
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg", ".txt")
+
+DEFERRED_CSS = "portfolio.css"
+FONTS_DIR = "fonts"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="icon" href="{icon}">
+{font_awesome}{font_preload}<style>{font_faces}{critical_css}</style>
+<link rel="preload" href="{deferred_css}" as="style" onload="this.onload=null;this.rel='stylesheet'">
+<noscript><link rel="stylesheet" href="{deferred_css}"></noscript>
+</head>
+<body>
+{sprite}
+<div class="stApp">
+{body}
+</div>
+{script}
+</body>
+</html>
+"""
+
+
+def favicon_data_uri(emoji):
+    """Inline the emoji page icon as an SVG data URI, like st.set_page_config does."""
+    svg = (
+        "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'>"
+        f"<text y='.9em' font-size='90'>{emoji}</text></svg>"
+    )
+    return "data:image/svg+xml," + svg.replace("#", "%23")
+
+
+def vendored_url(vendored, url, assets):
+    """The exported copy of a vendored `url` (written through `assets`), or `url` itself."""
+    if vendored is None or url not in vendored.entries:
+        return url
+    return vendored.publish(url, assets)
+
+
+def vendor_css(css, vendored, assets):
+    """Point url() references in `css` at exported copies of vendored files."""
+    if vendored is None:
+        return css
+    return vendored.rewrite_css(css, lambda url: vendored.publish(url, assets))
+
+
+def page_css(sections, sprite, assets, vendored=None):
+    """Return (critical CSS, deferred CSS URL) for sections whose icons are already inlined.
+
+    The critical CSS is returned for inlining; the deferred part is written
+    through `assets` under a fingerprinted name.
+    """
+    body = "".join(section for _, section in sections)
+    critical_markup = "".join(section for name, section in sections if name in ("header", "hero"))
+    critical_css, deferred_css = stylesheet.build(stylesheet.CSS_PATH, body + sprite, critical_markup)
+    critical_css, deferred_css = (vendor_css(css, vendored, assets) for css in (critical_css, deferred_css))
+    return critical_css, assets.add(DEFERRED_CSS, deferred_css.encode("utf-8"))
+
+
+def assemble_page(sections, sprite, missing_icons, css, font_files=(), script="", font_awesome_url=FONT_AWESOME_URL):
+    """Fill the page template from already-built parts; `css` is a page_css() result."""
+    critical_css, deferred_css_href = css
+    font_awesome = f'<link rel="stylesheet" href="{font_awesome_url}">\n' if missing_icons else ""
+    return PAGE_TEMPLATE.format(
+        title=html.escape(PAGE_TITLE),
+        icon=favicon_data_uri(PAGE_ICON),
+        font_awesome=font_awesome,
+        font_preload=fonts.preload_links(font_files, FONTS_DIR),
+        font_faces=fonts.font_face_css(font_files, FONTS_DIR),
+        critical_css=critical_css,
+        deferred_css=deferred_css_href,
+        sprite=sprite,
+        body="".join(section for _, section in sections),
+        script=script,
+    )
+
+
+def render_page(sections, assets, font_files=(), script="", vendored=None):
+    """Render the given (name, html) sections into one complete HTML document.
+
+    The critical CSS and @font-face rules for `font_files` are inlined; the
+    deferred CSS is written through `assets` under a fingerprinted name, and
+    so are the vendored files the page uses.
+    """
+    sections, sprite, missing_icons = inline_icons(sections)
+    css = page_css(sections, sprite, assets, vendored)
+    font_awesome_url = vendored_url(vendored, FONT_AWESOME_URL, assets) if missing_icons else FONT_AWESOME_URL
+    return assemble_page(sections, sprite, missing_icons, css, font_files, script, font_awesome_url)
+
+
+def precompress_file(path):
+    """Write the gzip (and Brotli, when available) variants of one text asset."""
+    if not path.endswith(COMPRESSIBLE):
+        return
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def precompress(out_dir):
+    """Write gzip and Brotli variants of every text asset once, at build time."""
+    for dirpath, _, names in os.walk(out_dir):
+        for name in names:
+            precompress_file(os.path.join(dirpath, name))
+
+
+def export(out_dir, workers=None):
+    """Build the page and every asset it references into `out_dir`; returns the index.html path.
+
+    All referenced files have content-hashed names and are listed in the
+    asset manifest; only index.html keeps a stable URL.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    assets = AssetManifest(out_dir)
+    sources = [project.image for project in load_catalog().projects] + [ABOUT_IMAGE]
+    entries, _ = build_images(sources, os.path.join(out_dir, "images"), workers=workers)
+    for entry in entries.values():
+        for variant in entry.variants:
+            assets.add_existing(f"images/{variant.file}")
+    images = ImageManifest(entries, "images")
+    catalog = load_catalog(images=images, related=build_related())
+    cv_url = assets.add(CV_ASSET, build_cv())
+    sections = render_sections(catalog, images, cv_url)
+    markup = "".join(section for _, section in sections)
+    font_files = fonts.build_fonts(markup, os.path.join(out_dir, FONTS_DIR))
+    for font in font_files:
+        assets.add_existing(f"{FONTS_DIR}/{font.file}")
+    page = render_page(sections, assets, font_files, static_script(catalog), VendorManifest.load())
+    path = os.path.join(out_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    assets.save()
+    precompress(out_dir)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="dist", help="output directory (default: dist)")
+    parser.add_argument("--workers", type=int, default=None, help="image encoder processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    path = export(args.out, args.workers)
+    print(f"Wrote {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
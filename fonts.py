@@ -0,0 +1,141 @@
+"""Self-hosted, subsetted web fonts.
+
+The page is set in Merriweather and Montserrat. The source TTF files in
+assets/fonts/src are static instances of the google/fonts variable fonts at
+the weights below, cut to the Latin range (OFL, see the license files next
+to them). This build step subsets them to the characters the rendered page
+actually uses (plus printable ASCII for dynamic text) and writes WOFF2 files:
+
+    python fonts.py                 # builds static/fonts for the Streamlit app
+    python fonts.py --out dist/fonts
+
+Subsetting needs fontTools and brotli (both in requirements.txt); the
+app itself only reads the resulting manifest, so it runs fully offline. If a
+source file is missing its face is skipped and the CSS fallback stack is used.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, "assets", "fonts", "src")
+STATIC_DIR = os.path.join(ROOT, "static", "fonts")
+MANIFEST_NAME = "fonts.json"
+
+FontSource = namedtuple("FontSource", ["family", "weight", "file"])
+FontFile = namedtuple("FontFile", ["family", "weight", "file", "preload"])
+
+# The faces the stylesheet asks for
+SOURCES = [
+    FontSource("Merriweather", 300, "Merriweather-Light.ttf"),
+    FontSource("Merriweather", 400, "Merriweather-Regular.ttf"),
+    FontSource("Montserrat", 500, "Montserrat-Medium.ttf"),
+    FontSource("Montserrat", 600, "Montserrat-SemiBold.ttf"),
+    FontSource("Montserrat", 700, "Montserrat-Bold.ttf"),
+]
+
+# Faces used above the fold: the logo and hero heading, and the hero tagline
+PRELOAD = {("Montserrat", 700), ("Merriweather", 300)}
+
+# Always kept so text added at runtime (search results, form input) renders
+BASE_CHARS = "".join(chr(c) for c in range(0x20, 0x7F)) + " ©–—‘’“”…"
+
+SCRIPT_OR_STYLE = re.compile(r"<(script|style)\b.*?</\1>", re.S | re.I)
+TAG = re.compile(r"<[^>]+>")
+
+FONT_FACE = """@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};font-display:swap;src:url({url}) format('woff2')}}"""
+PRELOAD_LINK = '<link rel="preload" href="{url}" as="font" type="font/woff2" crossorigin>'
+
+
+def page_text(markup):
+    """Return the set of characters visible in `markup`, plus BASE_CHARS."""
+    text = html.unescape(TAG.sub(" ", SCRIPT_OR_STYLE.sub(" ", markup)))
+    return "".join(sorted(set(text) | set(BASE_CHARS)))
+
+
+def subset_font(src, dest, text):
+    """Write a WOFF2 subset of `src` containing only the glyphs for `text`."""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.desubroutinize = True
+    font = subset.load_font(src, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    tmp = dest + ".tmp"
+    subset.save_font(font, tmp, options)
+    os.replace(tmp, dest)
+
+
+def build_fonts(markup, out_dir=STATIC_DIR, source_dir=SOURCE_DIR):
+    """Subset every available source font for `markup` into `out_dir`.
+
+    Output names include a hash of the source font and character set, so a
+    subset is only rebuilt when either changes. Returns the FontFile list.
+    """
+    return subset_fonts(page_text(markup), out_dir, source_dir)
+
+
+def subset_fonts(text, out_dir=STATIC_DIR, source_dir=SOURCE_DIR):
+    """build_fonts() for a character set already extracted with page_text()."""
+    os.makedirs(out_dir, exist_ok=True)
+    built = []
+    for source in SOURCES:
+        path = os.path.join(source_dir, source.file)
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read() + text.encode("utf-8")).hexdigest()[:10]
+        name = f"{source.family.lower()}-{source.weight}.{digest}.woff2"
+        dest = os.path.join(out_dir, name)
+        if not os.path.exists(dest):
+            subset_font(path, dest, text)
+        built.append(FontFile(source.family, source.weight, name, (source.family, source.weight) in PRELOAD))
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump([font._asdict() for font in built], f, indent=2)
+    return built
+
+
+def load_manifest(out_dir=STATIC_DIR):
+    """Read the built font list; a missing manifest means no self-hosted fonts."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return [FontFile(**font) for font in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+def font_face_css(fonts, url_prefix):
+    """Return minified @font-face rules for the built fonts."""
+    prefix = url_prefix.rstrip("/") + "/"
+    return "".join(
+        FONT_FACE.format(family=font.family, weight=font.weight, url=prefix + font.file) for font in fonts
+    )
+
+
+def preload_links(fonts, url_prefix):
+    """Return <link rel="preload"> tags for the above-the-fold faces."""
+    prefix = url_prefix.rstrip("/") + "/"
+    return "".join(PRELOAD_LINK.format(url=prefix + font.file) for font in fonts if font.preload)
+
+
+def main(argv=None):
+    from catalog import load_catalog
+    from sections import render_sections
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=STATIC_DIR, help="output directory (default: static/fonts)")
+    args = parser.parse_args(argv)
+    markup = "".join(section for _, section in render_sections(load_catalog()))
+    built = build_fonts(markup, args.out)
+    print(f"{len(built)} of {len(SOURCES)} font faces subset into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Local HTTP stand-in for the remote asset hosts, for testing vendor.py.
+
+    python http_origin.py --root .cache/origin --make-fixtures --port 8001
+    python vendor.py --origin http://127.0.0.1:8001
+
+--make-fixtures first writes a stand-in file under --root for every URL
+vendor.py collects that has none yet. Images become plain JPEGs, and the
+Font Awesome stylesheet becomes a small one whose @font-face rules
+reference font files in ../webfonts, as the real one does, so vendor.py
+follows its url()s.
+
+Serves the files under --root as /<host>/<path> (query strings are ignored)
+over HTTP/1.1 keep-alive connections. Every response carries a strong ETag
+and Last-Modified, and If-None-Match / If-Modified-Since are answered with
+304. --fail-every N answers every Nth request with 503, --drop-every N closes
+the connection instead of answering, --delay adds latency per request, and
+--chunked sends bodies with chunked transfer encoding. These exercise the
+client's retries and body parsing. Connections and requests are logged, so
+connection reuse shows.
+"""
+import argparse
+import asyncio
+import email.utils
+import hashlib
+import io
+import itertools
+import mimetypes
+import os
+import posixpath
+import sys
+import time
+from urllib.parse import unquote, urljoin, urlsplit
+
+CHUNK_SIZE = 64 * 1024
+
+# The faces the stand-in Font Awesome stylesheet declares, like the real one
+FIXTURE_FONTS = ("fa-brands-400", "fa-regular-400", "fa-solid-900")
+FIXTURE_FONT_FACE = (
+    "@font-face{{font-family:'{name}';font-display:block;"
+    "src:url(../webfonts/{name}.woff2) format('woff2'),url(../webfonts/{name}.ttf) format('truetype')}}\n"
+)
+FIXTURE_IMAGE_SIZE = (1600, 1067)
+
+# Image CDNs serve extensionless paths, so fixtures are typed by their magic bytes
+MAGIC = ((b"\xff\xd8\xff", "image/jpeg"), (b"\x89PNG", "image/png"), (b"GIF8", "image/gif"))
+
+
+def content_type(path, body):
+    if body[:4] == b"RIFF" and body[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, kind in MAGIC:
+        if body.startswith(magic):
+            return kind
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def fixture_path(root, url):
+    """Where the stand-in for `url` lives under `root`: <host>/<path>, query dropped."""
+    parts = urlsplit(url)
+    path = posixpath.normpath("/" + unquote(parts.path)).lstrip("/")
+    return os.path.join(root, parts.hostname, *path.split("/"))
+
+
+def _write_fixture(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_fixtures(root):
+    """Write a stand-in for every URL vendor.py collects and `root` lacks; returns the count."""
+    from PIL import Image
+
+    from vendor import collect_urls
+
+    written = 0
+    for url in collect_urls():
+        path = fixture_path(root, url)
+        if os.path.exists(path):
+            continue
+        seed = hashlib.sha256(url.encode("utf-8")).digest()
+        if path.endswith(".css"):
+            _write_fixture(path, "".join(FIXTURE_FONT_FACE.format(name=name) for name in FIXTURE_FONTS).encode())
+            for name in FIXTURE_FONTS:
+                # Not real fonts: just the right magic and a few dozen KB, so bodies span several reads
+                for ext, magic in ((".woff2", b"wOF2"), (".ttf", b"\x00\x01\x00\x00")):
+                    font = urljoin(url, f"../webfonts/{name}{ext}")
+                    _write_fixture(fixture_path(root, font), magic + hashlib.sha256(font.encode()).digest() * 1024)
+                    written += 1
+        else:
+            image = Image.new("RGB", FIXTURE_IMAGE_SIZE, tuple(seed[:3]))
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=80)
+            _write_fixture(path, buffer.getvalue())
+        written += 1
+    return written
+
+
+class Origin:
+    def __init__(self, root, fail_every=0, drop_every=0, delay=0.0, chunked=False):
+        self.root = os.path.abspath(root)
+        self.fail_every = fail_every
+        self.drop_every = drop_every
+        self.delay = delay
+        self.chunked = chunked
+        self.connections = itertools.count(1)
+        self.requests = itertools.count(1)
+
+    def log(self, text):
+        print(f"{time.strftime('%H:%M:%S')} {text}", flush=True)
+
+    def resolve(self, target):
+        path = posixpath.normpath("/" + unquote(urlsplit(target).path)).lstrip("/")
+        path = os.path.join(self.root, *path.split("/"))
+        return path if os.path.isfile(path) else None
+
+    async def handle(self, reader, writer):
+        connection = next(self.connections)
+        self.log(f"connection {connection} opened")
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                if not await self.respond(connection, writer, method, target, headers):
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self.log(f"connection {connection} closed")
+
+    async def respond(self, connection, writer, method, target, headers):
+        """Answer one request; returns False when the connection should be closed."""
+        number = next(self.requests)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.drop_every and number % self.drop_every == 0:
+            self.log(f"connection {connection}: {method} {target} -> dropped")
+            return False
+        if self.fail_every and number % self.fail_every == 0:
+            self.log(f"connection {connection}: {method} {target} -> 503")
+            await self.send(writer, 503, {"Retry-After": "0"}, b"Service Unavailable\n")
+            return True
+        path = self.resolve(target) if method in ("GET", "HEAD") else None
+        if path is None:
+            self.log(f"connection {connection}: {method} {target} -> 404")
+            await self.send(writer, 404, {}, b"Not Found\n")
+            return True
+        with open(path, "rb") as f:
+            body = f.read()
+        mtime = int(os.path.getmtime(path))
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        response_headers = {
+            "Content-Type": content_type(path, body),
+            "ETag": etag,
+            "Last-Modified": email.utils.formatdate(mtime, usegmt=True),
+        }
+        if_none_match = headers.get("if-none-match")
+        if_modified_since = headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = etag in (tag.strip() for tag in if_none_match.split(","))
+        elif if_modified_since:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            not_modified = mtime <= since
+        else:
+            not_modified = False
+        if not_modified:
+            self.log(f"connection {connection}: {method} {target} -> 304")
+            await self.send(writer, 304, response_headers, b"")
+            return True
+        self.log(f"connection {connection}: {method} {target} -> 200 ({len(body):,} bytes)")
+        await self.send(writer, 200, response_headers, b"" if method == "HEAD" else body)
+        return True
+
+    async def send(self, writer, status, headers, body):
+        reason = {200: "OK", 304: "Not Modified", 404: "Not Found", 503: "Service Unavailable"}[status]
+        lines = [f"HTTP/1.1 {status} {reason}", *(f"{name}: {value}" for name, value in headers.items())]
+        if status != 304:
+            lines.append("Transfer-Encoding: chunked" if self.chunked else f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if status != 304 and self.chunked:
+            for start in range(0, len(body), CHUNK_SIZE):
+                chunk = body[start:start + CHUNK_SIZE]
+                writer.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+            writer.write(b"0\r\n\r\n")
+        elif status != 304:
+            writer.write(body)
+        await writer.drain()
+
+
+async def serve(host, port, origin):
+    server = await asyncio.start_server(origin.handle, host, port)
+    origin.log(f"serving {origin.root} on http://{host}:{port}/<host>/<path>")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", required=True, help="directory holding <host>/<path> files")
+    parser.add_argument("--make-fixtures", action="store_true", help="first write stand-ins for what vendor.py fetches")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with 503")
+    parser.add_argument("--drop-every", type=int, default=0, help="close the connection on every Nth request")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--chunked", action="store_true", help="send bodies with chunked transfer encoding")
+    args = parser.parse_args(argv)
+    if args.make_fixtures:
+        print(f"{write_fixtures(args.root)} fixture files written to {args.root}", flush=True)
+    origin = Origin(args.root, args.fail_every, args.drop_every, args.delay, args.chunked)
+    try:
+        asyncio.run(serve(args.host, args.port, origin))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Responsive image pipeline.
+
+Local source images, and remote ones vendored by vendor.py, are resized with
+Pillow into WebP and JPEG variants for each layout breakpoint, then served
+through <picture>/srcset markup:
+
+    python images.py                 # builds static/images for the Streamlit app
+    python images.py --out dist/images
+
+Every image also gets a tiny blurred placeholder, inlined as a base64 data
+URI, and its intrinsic size is recorded in the manifest so <img> tags carry
+width/height and can be lazy-loaded without layout shift.
+
+Encoded variants live in a content-addressed cache (.cache/images), keyed by
+the source bytes and encoding settings, so unchanged images are never
+re-encoded. Cache misses are encoded across a process pool. Pillow and the
+pool are imported by the build functions only, so the app can read the
+manifest (ImageManifest) without loading either at startup.
+"""
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+import shutil
+from collections import namedtuple
+
+from vendor import vendored_path
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DIR = os.path.join(ROOT, "content")
+CACHE_DIR = os.path.join(ROOT, ".cache", "images")
+STATIC_DIR = os.path.join(ROOT, "static", "images")
+MANIFEST_NAME = "manifest.json"
+
+# The media query breakpoints in the page CSS, plus the container's max-width
+WIDTHS = (768, 992, 1200)
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpg": ("JPEG", "image/jpeg")}
+QUALITY = 80
+
+PLACEHOLDER_WIDTH = 20
+PLACEHOLDER_QUALITY = 40
+
+# Bump to invalidate every cached variant when the encoding logic changes
+PIPELINE_VERSION = "1"
+
+Variant = namedtuple("Variant", ["width", "height", "format", "file"])
+ImageEntry = namedtuple("ImageEntry", ["width", "height", "placeholder", "variants"])
+
+
+def is_local(src):
+    return not src.startswith(("http://", "https://", "data:", "//"))
+
+
+def source_path(src):
+    """Resolve a catalog image reference to a file under content/, or to the
+    vendored copy of a remote URL (None if it has not been vendored)."""
+    if is_local(src):
+        return os.path.join(CONTENT_DIR, src)
+    return vendored_path(src)
+
+
+def has_source(src):
+    return is_local(src) or source_path(src) is not None
+
+
+def _variant_key(data, width, ext):
+    h = hashlib.sha256()
+    h.update(data)
+    h.update(f"\0{width}\0{ext}\0{QUALITY}\0{PIPELINE_VERSION}".encode())
+    return h.hexdigest()[:20]
+
+
+def _encode(job):
+    """Resize one source to one width/format and write it to the cache."""
+    from PIL import Image, ImageOps
+
+    path, width, ext, dest = job
+    with Image.open(path) as im:
+        im = ImageOps.exif_transpose(im).convert("RGB")
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        tmp = dest + ".tmp"
+        pil_format = FORMATS[ext][0]
+        if pil_format == "JPEG":
+            im.save(tmp, pil_format, quality=QUALITY, optimize=True, progressive=True)
+        else:
+            im.save(tmp, pil_format, quality=QUALITY, method=4)
+        os.replace(tmp, dest)
+        return im.size
+
+
+def _placeholder(path):
+    """Encode a tiny blurred JPEG of the image as a data URI."""
+    from PIL import Image, ImageFilter, ImageOps
+
+    with Image.open(path) as im:
+        im = ImageOps.exif_transpose(im).convert("RGB")
+        im.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH * 4))
+        im = im.filter(ImageFilter.GaussianBlur(1))
+        buf = io.BytesIO()
+        im.save(buf, "JPEG", quality=PLACEHOLDER_QUALITY)
+    return "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _cached_placeholder(src, cache_dir):
+    with open(source_path(src), "rb") as f:
+        key = _variant_key(f.read(), PLACEHOLDER_WIDTH, "lqip")
+    path = os.path.join(cache_dir, key[:2], f"{key}.txt")
+    try:
+        with open(path, encoding="ascii") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    uri = _placeholder(source_path(src))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="ascii") as f:
+        f.write(uri)
+    return uri
+
+
+def _plan(src, cache_dir):
+    """List the (width, ext, cache path) variants a source needs."""
+    from PIL import Image, ImageOps
+
+    with open(source_path(src), "rb") as f:
+        data = f.read()
+    with Image.open(source_path(src)) as im:
+        natural = ImageOps.exif_transpose(im).width
+    # Never upscale: widths above the source collapse into one full-size variant
+    widths = sorted({min(width, natural) for width in WIDTHS})
+    plan = []
+    for ext in FORMATS:
+        for width in widths:
+            key = _variant_key(data, width, ext)
+            plan.append((width, ext, os.path.join(cache_dir, key[:2], f"{key}.{ext}")))
+    return plan
+
+
+def build_images(sources, out_dir=STATIC_DIR, cache_dir=CACHE_DIR, workers=None):
+    """Build variants for every local source and write them plus a manifest to `out_dir`.
+
+    Returns (manifest, number of variants encoded), where the manifest maps
+    each source to an ImageEntry.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from PIL import Image
+
+    sources = sorted({src for src in sources if has_source(src)})
+    plans = {src: _plan(src, cache_dir) for src in sources}
+    jobs = []
+    for src, plan in plans.items():
+        for width, ext, dest in plan:
+            if not os.path.exists(dest):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                jobs.append((source_path(src), width, ext, dest))
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_encode, jobs, chunksize=4))
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    for src, plan in plans.items():
+        variants = []
+        for width, ext, cached in plan:
+            name = os.path.basename(cached)
+            target = os.path.join(out_dir, name)
+            if not os.path.exists(target):
+                shutil.copyfile(cached, target)
+            with Image.open(cached) as im:
+                variants.append(Variant(im.width, im.height, ext, name))
+        largest = max(variants, key=lambda v: v.width)
+        manifest[src] = ImageEntry(largest.width, largest.height, _cached_placeholder(src, cache_dir), variants)
+    data = {
+        src: dict(entry._asdict(), variants=[v._asdict() for v in entry.variants])
+        for src, entry in manifest.items()
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return manifest, len(jobs)
+
+
+class ImageManifest:
+    """Maps catalog image references to responsive, lazy-loaded <picture> markup."""
+
+    def __init__(self, entries, url_prefix):
+        self.entries = entries
+        self.url_prefix = url_prefix.rstrip("/") + "/"
+
+    @classmethod
+    def load(cls, out_dir=STATIC_DIR, url_prefix="app/static/images"):
+        """Read a built manifest; a missing one yields an empty manifest."""
+        try:
+            with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        entries = {
+            src: ImageEntry(**dict(entry, variants=[Variant(**v) for v in entry["variants"]]))
+            for src, entry in data.items()
+        }
+        return cls(entries, url_prefix)
+
+    def srcset(self, variants, ext):
+        return ", ".join(f"{self.url_prefix}{v.file} {v.width}w" for v in variants if v.format == ext)
+
+    def img_html(self, src, alt, sizes, lazy=True):
+        """Return <picture> markup for `src`, or a plain <img> if it was not built.
+
+        Built images carry their intrinsic size and paint a blurred placeholder
+        as the <img> background until the real image has loaded.
+        """
+        loading = ' loading="lazy" decoding="async"' if lazy else ""
+        entry = self.entries.get(src)
+        if entry is None:
+            return f'<img src="{html.escape(src)}" alt="{html.escape(alt)}"{loading}>'
+        variants = entry.variants
+        fallback = max((v for v in variants if v.format == "jpg"), key=lambda v: v.width)
+        return (
+            f'<picture><source type="image/webp" srcset="{self.srcset(variants, "webp")}" sizes="{sizes}">'
+            f'<img src="{self.url_prefix}{fallback.file}" srcset="{self.srcset(variants, "jpg")}" '
+            f'sizes="{sizes}" width="{entry.width}" height="{entry.height}" alt="{html.escape(alt)}"{loading} '
+            f'style="background: url({entry.placeholder}) center / cover no-repeat;"></picture>'
+        )
+
+
+def main(argv=None):
+    from catalog import load_catalog
+    from sections import ABOUT_IMAGE
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=STATIC_DIR, help="output directory (default: static/images)")
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    sources = [project.image for project in load_catalog().projects] + [ABOUT_IMAGE]
+    manifest, encoded = build_images(sources, args.out, workers=args.workers)
+    print(f"{len(manifest)} images, {encoded} variants encoded, written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Local HTTP load generator for serve.py.
+
+    python serve.py dist --port 8000 &
+    python loadgen.py http://127.0.0.1:8000/ -c 64 -d 10
+    python loadgen.py http://127.0.0.1:8000/ --revalidate   # If-None-Match -> 304
+
+Opens `-c` keep-alive connections and sends requests back to back on each
+for `-d` seconds, then prints requests/second and latency percentiles as
+JSON. It speaks just enough HTTP/1.1 for a static file server and needs no
+third-party packages.
+"""
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values`, which may be in any order."""
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+def summarize(samples, scale=1000):
+    """p50/p95/p99/max/mean of `samples` times `scale` (seconds to ms by default).
+
+    The benchmarks in benchmarks/ report their timings through this too, so
+    all of them compute and round percentiles the same way.
+    """
+    samples = sorted(samples)
+    point = lambda value: round(value * scale, 3)
+    summary = {f"p{pct}": point(percentile(samples, pct)) for pct in (50, 95, 99)}
+    return dict(summary, max=point(samples[-1]), mean=point(statistics.fmean(samples)))
+
+
+async def read_response(reader):
+    """Read one response; returns (status, headers, body length)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    return status, headers, length
+
+
+async def worker(host, port, request, deadline, results, revalidate):
+    latencies, statuses, nbytes = results
+    reader = writer = None
+    etag = None
+    while time.perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        payload = request
+        if revalidate and etag:
+            payload = request[:-2] + f"If-None-Match: {etag}\r\n\r\n".encode()
+        start = time.perf_counter()
+        try:
+            writer.write(payload)
+            status, headers, length = await read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            reader = writer = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+        nbytes[0] += length
+        etag = headers.get("etag", etag)
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, connections, duration, accept_encoding, revalidate):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        f"Accept-Encoding: {accept_encoding}\r\n\r\n"
+    ).encode()
+    results = ([], {}, [0])
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(host, port, request, deadline, results, revalidate) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies, statuses, nbytes = results
+    return {
+        "url": url,
+        "connections": connections,
+        "seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "bytes_per_second": round(nbytes[0] / elapsed),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "latency_ms": summarize(latencies) if latencies else {},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url")
+    parser.add_argument("-c", "--connections", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--accept-encoding", default="br, gzip")
+    parser.add_argument("--revalidate", action="store_true", help="send If-None-Match with the last ETag seen")
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.url, args.connections, args.duration, args.accept_encoding, args.revalidate))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
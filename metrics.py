@@ -0,0 +1,189 @@
+"""Per-section render metrics in Prometheus text format.
+
+Instrumentation is off unless one of these is set:
+
+    PORTFOLIO_METRICS_PORT=9108                  # serve http://127.0.0.1:9108/metrics
+    PORTFOLIO_METRICS_FILE=/var/lib/node_exporter/portfolio.prom   # file sink
+
+When disabled, timed() hands back one shared no-op timer, so the hooks cost
+a function call and nothing else. When enabled, each timed block records its
+latency in a fixed-bucket histogram plus the bytes of the payload assigned to
+the timer, and every rerun is counted per session:
+
+    with metrics.timed("header") as timer:
+        timer.payload = html
+        st.markdown(html, unsafe_allow_html=True)
+"""
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT = os.environ.get("PORTFOLIO_METRICS_PORT")
+FILE = os.environ.get("PORTFOLIO_METRICS_FILE")
+ENABLED = bool(PORT or FILE)
+
+# Seconds; a section render is normally well under a millisecond
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+# Rerun counts are kept for the most recently active sessions only
+MAX_SESSIONS = 1000
+FILE_INTERVAL = 15
+
+
+class Registry:
+    """Thread-safe store for the section histograms and rerun counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sections = {}
+        self.reruns = 0
+        self.session_reruns = OrderedDict()
+
+    def observe(self, name, seconds, nbytes):
+        with self.lock:
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = [[0] * (len(BUCKETS) + 1), 0.0, 0, 0]
+            stats[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+            stats[1] += seconds
+            stats[2] += 1
+            stats[3] += nbytes
+
+    def rerun(self, session_id):
+        with self.lock:
+            self.reruns += 1
+            count = self.session_reruns.pop(session_id, 0) + 1
+            self.session_reruns[session_id] = count
+            if len(self.session_reruns) > MAX_SESSIONS:
+                self.session_reruns.popitem(last=False)
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self.lock:
+            sections = {name: (list(b), s, c, n) for name, (b, s, c, n) in self.sections.items()}
+            reruns = self.reruns
+            sessions = list(self.session_reruns.items())
+        lines = [
+            "# HELP portfolio_section_render_seconds Time to render and emit one page section.",
+            "# TYPE portfolio_section_render_seconds histogram",
+        ]
+        for name, (buckets, total, count, _) in sorted(sections.items()):
+            cumulative = 0
+            for bound, hits in zip(BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f'portfolio_section_render_seconds_bucket{{section="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'portfolio_section_render_seconds_bucket{{section="{name}",le="+Inf"}} {count}')
+            lines.append(f'portfolio_section_render_seconds_sum{{section="{name}"}} {total:.9f}')
+            lines.append(f'portfolio_section_render_seconds_count{{section="{name}"}} {count}')
+        lines += [
+            "# HELP portfolio_section_bytes_total Payload bytes emitted per page section.",
+            "# TYPE portfolio_section_bytes_total counter",
+        ]
+        for name, (_, _, _, nbytes) in sorted(sections.items()):
+            lines.append(f'portfolio_section_bytes_total{{section="{name}"}} {nbytes}')
+        lines += [
+            "# HELP portfolio_reruns_total Script reruns across all sessions.",
+            "# TYPE portfolio_reruns_total counter",
+            f"portfolio_reruns_total {reruns}",
+            "# HELP portfolio_session_reruns Script reruns per recently active session.",
+            "# TYPE portfolio_session_reruns gauge",
+        ]
+        for session_id, count in sessions:
+            lines.append(f'portfolio_session_reruns{{session="{session_id}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _NullTimer:
+    __slots__ = ("payload",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("name", "payload", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.payload = ""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        REGISTRY.observe(self.name, elapsed, len(self.payload.encode("utf-8")))
+
+
+def timed(name):
+    """Time the enclosed block as section `name`; set `.payload` to what it emits."""
+    if not ENABLED:
+        return _NULL
+    return _Timer(name)
+
+
+def rerun():
+    """Count one script run for the current Streamlit session."""
+    if ENABLED:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        REGISTRY.rerun(ctx.session_id if ctx else "bare")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_file(path):
+    while True:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(REGISTRY.render())
+        os.replace(tmp, path)
+        time.sleep(FILE_INTERVAL)
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start():
+    """Start the configured exporters once per process; a no-op when disabled."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        if PORT:
+            server = ThreadingHTTPServer(("127.0.0.1", int(PORT)), _Handler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        if FILE:
+            threading.Thread(target=_write_file, args=(FILE,), name="metrics-file", daemon=True).start()
+        _started = True
@@ -0,0 +1,321 @@
+"""Durable outbox for contact-form inquiries, drained by a background worker.
+
+    python outbox.py                 # queue status
+    python outbox.py --drain         # deliver everything that is due, then exit
+
+The form only inserts a row into a SQLite database in WAL mode (one short
+transaction, no network), so a visitor never waits on SMTP. Delivery is
+configured through the environment and is off unless a host is set:
+
+    PORTFOLIO_SMTP_HOST=smtp.example.com   PORTFOLIO_SMTP_PORT=587
+    PORTFOLIO_SMTP_USER=...                PORTFOLIO_SMTP_PASSWORD=...
+    PORTFOLIO_SMTP_STARTTLS=1              PORTFOLIO_CONTACT_TO=me@example.com
+
+start() runs one worker thread per process. It claims due messages in
+batches, sends a batch over one SMTP connection and keeps that connection
+open for reuse until it has been idle for a while. Transient failures
+(4xx replies, dropped connections) are retried with exponential backoff;
+permanent 5xx rejections and messages out of attempts are marked failed and
+stay in the database, and so does a row that cannot be turned into a
+message. Rows survive restarts, so nothing queued is lost. Control
+characters are stripped from form input before it is stored, and the
+visitor's address only reaches the headers through formataddr().
+For local testing, run smtp_sink.py and point PORTFOLIO_SMTP_HOST at it.
+"""
+import argparse
+import email.errors
+import os
+import re
+import smtplib
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from email.message import EmailMessage
+from email.utils import formataddr
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUTBOX_PATH = os.environ.get("PORTFOLIO_OUTBOX", os.path.join(ROOT, ".cache", "outbox.sqlite3"))
+
+SMTP_HOST = os.environ.get("PORTFOLIO_SMTP_HOST")
+SMTP_PORT = int(os.environ.get("PORTFOLIO_SMTP_PORT", "587"))
+SMTP_USER = os.environ.get("PORTFOLIO_SMTP_USER")
+SMTP_PASSWORD = os.environ.get("PORTFOLIO_SMTP_PASSWORD")
+SMTP_STARTTLS = os.environ.get("PORTFOLIO_SMTP_STARTTLS", "") not in ("", "0")
+SENDER = os.environ.get("PORTFOLIO_SMTP_FROM", "portfolio@localhost")
+CONTACT_TO = os.environ.get("PORTFOLIO_CONTACT_TO", "owinojerim269@gmail.com")
+ENABLED = bool(SMTP_HOST)
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 6
+# Seconds; attempt n waits RETRY_DELAY * 2**(n - 1), capped at MAX_RETRY_DELAY
+RETRY_DELAY = float(os.environ.get("PORTFOLIO_SMTP_RETRY_DELAY", "30"))
+MAX_RETRY_DELAY = 3600
+# Close the SMTP connection after this long without anything to send
+IDLE_TIMEOUT = 60
+POLL_INTERVAL = 30
+SMTP_TIMEOUT = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    sent REAL
+);
+CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt);
+"""
+
+Inquiry = namedtuple("Inquiry", ["id", "created", "name", "email", "body", "attempts"])
+
+# C0 controls and DEL; the message body keeps its line breaks and tabs
+CONTROL = re.compile(r"[\x00-\x1f\x7f]")
+BODY_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+
+def single_line(text):
+    """`text` with control characters (CR and LF included) turned into spaces."""
+    return " ".join(CONTROL.sub(" ", text).split())
+
+
+def connect(path=OUTBOX_PATH):
+    """Open the outbox database, creating it in WAL mode on first use."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(name, email, body, path=OUTBOX_PATH):
+    """Queue one inquiry and wake the worker; returns the message id.
+
+    Control characters are stripped here, so no header built from `name` or
+    `email` can be split by a CR or LF.
+    """
+    name, email, body = single_line(name), single_line(email), BODY_CONTROL.sub("", body.replace("\r\n", "\n"))
+    now = time.time()
+    conn = connect(path)
+    try:
+        cursor = conn.execute(
+            "INSERT INTO messages (created, name, email, body, next_attempt) VALUES (?, ?, ?, ?, ?)",
+            (now, name, email, body, now),
+        )
+    finally:
+        conn.close()
+    _wake.set()
+    return cursor.lastrowid
+
+
+def claim(conn, limit=BATCH_SIZE, now=None):
+    """Pending messages that are due, oldest first."""
+    rows = conn.execute(
+        "SELECT id, created, name, email, body, attempts FROM messages"
+        " WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+        (time.time() if now is None else now, limit),
+    )
+    return [Inquiry(*row) for row in rows]
+
+
+def next_due(conn):
+    """Seconds until the next pending message is due, or None if there is none."""
+    (due,) = conn.execute("SELECT MIN(next_attempt) FROM messages WHERE status = 'pending'").fetchone()
+    return None if due is None else max(0.0, due - time.time())
+
+
+def status(conn):
+    return dict(conn.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+
+
+def build_message(inquiry):
+    """The email for one inquiry; raises ValueError or MessageError for an unusable address."""
+    name = single_line(inquiry.name)
+    # Non-ASCII addresses would need SMTPUTF8, which the form does not accept
+    if CONTROL.search(inquiry.email) or not inquiry.email.strip() or " " in inquiry.email or not inquiry.email.isascii():
+        raise ValueError(f"unusable reply-to address {inquiry.email!r}")
+    msg = EmailMessage()
+    msg["From"] = SENDER
+    msg["To"] = CONTACT_TO
+    # formataddr quotes the display name, so "Smith, Bob" stays one address
+    msg["Reply-To"] = formataddr((name, inquiry.email))
+    msg["Subject"] = f"Portfolio inquiry from {name}"
+    # Stable per row, so a retried message can be recognised as a duplicate
+    msg["Message-ID"] = f"<inquiry.{inquiry.id}.{int(inquiry.created)}@portfolio.local>"
+    sent_at = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(inquiry.created))
+    msg.set_content(f"{inquiry.body}\n\n--\n{name} <{inquiry.email}>\nSent {sent_at} via the portfolio contact form\n")
+    return msg
+
+
+class Deliverer:
+    """Sends batches over one reusable SMTP connection."""
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, user=SMTP_USER, password=SMTP_PASSWORD, starttls=SMTP_STARTTLS):
+        self.host, self.port = host, port
+        self.user, self.password, self.starttls = user, password, starttls
+        self.smtp = None
+        self.last_used = 0.0
+
+    def _connection(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.noop()
+                return self.smtp
+            except (OSError, smtplib.SMTPException):
+                self.close()
+        smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        if self.starttls:
+            smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password or "")
+        self.smtp = smtp
+        return smtp
+
+    def send_batch(self, conn, inquiries):
+        """Deliver `inquiries`, recording each outcome; returns the number sent."""
+        sent = []
+        try:
+            smtp = self._connection()
+        except (OSError, smtplib.SMTPException) as exc:
+            for inquiry in inquiries:
+                _retry(conn, inquiry, f"connect: {exc}")
+            return 0
+        for inquiry in inquiries:
+            try:
+                message = build_message(inquiry)
+            except (ValueError, email.errors.MessageError) as exc:
+                # Retrying would fail the same way, and the row would hold up the queue
+                _fail(conn, inquiry, f"message: {exc}")
+                continue
+            try:
+                smtp.send_message(message)
+                sent.append(inquiry.id)
+            except smtplib.SMTPRecipientsRefused as exc:
+                _fail(conn, inquiry, str(exc.recipients))
+            except smtplib.SMTPResponseException as exc:
+                if 400 <= exc.smtp_code < 500:
+                    _retry(conn, inquiry, f"{exc.smtp_code} {exc.smtp_error!r}")
+                else:
+                    _fail(conn, inquiry, f"{exc.smtp_code} {exc.smtp_error!r}")
+            except (OSError, smtplib.SMTPException) as exc:
+                # Connection lost mid-batch: retry this one, reconnect for the rest
+                _retry(conn, inquiry, str(exc))
+                self.close()
+                try:
+                    smtp = self._connection()
+                except (OSError, smtplib.SMTPException):
+                    for rest in inquiries[inquiries.index(inquiry) + 1:]:
+                        _retry(conn, rest, "connection lost")
+                    break
+        if sent:
+            conn.executemany(
+                "UPDATE messages SET status = 'sent', sent = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                [(time.time(), message_id) for message_id in sent],
+            )
+        self.last_used = time.monotonic()
+        return len(sent)
+
+    def close_if_idle(self):
+        if self.smtp is not None and time.monotonic() - self.last_used > IDLE_TIMEOUT:
+            self.close()
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (OSError, smtplib.SMTPException):
+                pass
+            self.smtp = None
+
+
+def _retry(conn, inquiry, error):
+    attempts = inquiry.attempts + 1
+    if attempts >= MAX_ATTEMPTS:
+        _fail(conn, inquiry, error)
+        return
+    delay = min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    conn.execute(
+        "UPDATE messages SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+        (attempts, time.time() + delay, error, inquiry.id),
+    )
+
+
+def _fail(conn, inquiry, error):
+    conn.execute(
+        "UPDATE messages SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+        (error, inquiry.id),
+    )
+
+
+def drain(conn, deliverer):
+    """Send every message that is due, batch by batch; returns the number sent."""
+    total = 0
+    while True:
+        batch = claim(conn)
+        if not batch:
+            return total
+        total += deliverer.send_batch(conn, batch)
+
+
+_wake = threading.Event()
+
+
+def _work(path):
+    conn = connect(path)
+    deliverer = Deliverer()
+    while True:
+        try:
+            drain(conn, deliverer)
+            due = next_due(conn)
+        except Exception as exc:  # keep the worker alive; the rows stay queued for the next round
+            print(f"outbox: delivery failed: {exc!r}", flush=True)
+            deliverer.close()
+            due = None
+        timeout = POLL_INTERVAL if due is None else min(due, POLL_INTERVAL)
+        # Keep the connection only while more mail is likely soon
+        if _wake.wait(min(timeout, IDLE_TIMEOUT) if deliverer.smtp else timeout):
+            _wake.clear()
+        deliverer.close_if_idle()
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start(path=OUTBOX_PATH):
+    """Start the delivery worker once per process; a no-op unless SMTP is configured."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        threading.Thread(target=_work, args=(path,), name="outbox-worker", daemon=True).start()
+        _started = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drain", action="store_true", help="deliver every due message, then exit")
+    parser.add_argument("--db", default=OUTBOX_PATH, help="outbox database (default: .cache/outbox.sqlite3)")
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+    if args.drain:
+        if not ENABLED:
+            parser.error("set PORTFOLIO_SMTP_HOST to deliver mail")
+        deliverer = Deliverer()
+        try:
+            print(f"Sent {drain(conn, deliverer)} messages")
+        finally:
+            deliverer.close()
+    print(", ".join(f"{count} {state}" for state, count in sorted(status(conn).items())) or "Outbox is empty")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Client-side project filtering for the Streamlit app and the static export.
+
+The catalog precomputes a category -> card id index (Catalog.filter_index).
+It is handed to the browser once as JSON, and the filter buttons only show
+or hide cards that are already on the page: no rerun, no server round trip.
+
+In the app the buttons are a custom component mounted once per session:
+
+    project_filter.mount(catalog)
+
+The exported page gets the same code as a plain <script> (static_script).
+The anchor smooth-scrolling that used to live in the dead inline script is
+installed here as well.
+"""
+import json
+
+from catalog import ALL
+
+COMPONENT_NAME = "project_filter"
+
+# Shared by both entry points. `index` maps a category to the data-id of every
+# card in it; unknown categories show everything.
+FILTER_JS = """
+function applyProjectFilter(index, category) {
+    const ids = index[category];
+    const visible = ids ? new Set(ids) : null;
+    document.querySelectorAll('.project-card[data-id]').forEach(card => {
+        card.style.display = !visible || visible.has(card.dataset.id) ? '' : 'none';
+    });
+}
+
+function bindFilterButtons(buttons, index, onSelect) {
+    buttons.forEach(button => {
+        button.addEventListener('click', () => {
+            buttons.forEach(btn => btn.classList.toggle('active', btn === button));
+            applyProjectFilter(index, button.dataset.category);
+            if (onSelect) onSelect(button.dataset.category);
+        });
+    });
+}
+
+function smoothScroll(event) {
+    const anchor = event.target.closest && event.target.closest('a[href^="#"]');
+    if (!anchor || anchor.getAttribute('href').length < 2) return;
+    const target = document.querySelector(anchor.getAttribute('href'));
+    if (!target) return;
+    event.preventDefault();
+    // A related-pieces link may point at a card the active filter hides
+    if (target.classList.contains('project-card')) target.style.display = '';
+    target.scrollIntoView({behavior: 'smooth'});
+}
+"""
+
+# The component builds its buttons from the JSON payload and remembers the
+# active category on its root element, so a rerun that remounts it (or
+# re-renders the grid) re-applies the current filter instead of resetting it.
+COMPONENT_JS = FILTER_JS + """
+export default function(component) {
+    const [all, filters, index] = component.data;
+    const root = component.parentElement.querySelector('.projects-filter');
+    const active = root.dataset.active || all;
+    root.replaceChildren(...filters.map(category => {
+        const button = document.createElement('button');
+        button.className = 'filter-btn' + (category === active ? ' active' : '');
+        button.dataset.category = category;
+        button.textContent = category;
+        return button;
+    }));
+    bindFilterButtons(root.querySelectorAll('.filter-btn'), index, category => {
+        root.dataset.active = category;
+    });
+    applyProjectFilter(index, active);
+    document.addEventListener('click', smoothScroll);
+    return () => document.removeEventListener('click', smoothScroll);
+}
+"""
+
+COMPONENT_HTML = '<div class="projects-filter"></div>'
+
+STATIC_SCRIPT = """
+<script>
+{js}
+document.addEventListener('DOMContentLoaded', () => {{
+    const index = {index};
+    bindFilterButtons(document.querySelectorAll('.filter-btn'), index);
+    document.addEventListener('click', smoothScroll);
+}});
+</script>
+"""
+
+_component = None
+
+
+def payload(catalog):
+    """The data the filter needs: [default label, button labels, card index].
+
+    A list rather than a dict: Streamlit scans the top level of a dict for
+    dataframes, which imports pandas on the first render.
+    """
+    return [ALL, list(catalog.filter_index), catalog.filter_index]
+
+
+def mount(catalog, key="project_filter"):
+    """Render the filter buttons as a custom component bound to the project grid."""
+    global _component
+    if _component is None:
+        import streamlit as st
+
+        # Unisolated so the page's .filter-btn rules style the buttons
+        _component = st.components.v2.component(
+            COMPONENT_NAME, html=COMPONENT_HTML, js=COMPONENT_JS, isolate_styles=False,
+        )
+    return _component(key=key, data=payload(catalog))
+
+
+def static_script(catalog):
+    """The same filter as an inline script for the exported page's filter buttons."""
+    return STATIC_SCRIPT.format(js=FILTER_JS, index=json.dumps(catalog.filter_index, separators=(",", ":")))
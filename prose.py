@@ -0,0 +1,239 @@
+"""Markdown writing samples compiled to sanitized HTML fragments.
+
+    python prose.py                  # compile content/samples into .cache/prose
+    python prose.py --workers 8 path/to/*.md
+
+Fragments are rendered with st.markdown(unsafe_allow_html=True), so they must
+be safe to inline. The converter handles the Markdown the samples use
+(headings, paragraphs, emphasis, links, images, lists, block quotes, code and
+rules) and is sanitizing by construction. All source text is HTML-escaped
+before any markup is added, so raw HTML in a source shows up as text. The
+only tags emitted are the ones the converter writes itself (TAGS), and link
+and image URLs are limited to SAFE_SCHEMES or relative paths.
+
+Compiled fragments are cached under .cache/prose, keyed by a hash of the
+source bytes and PIPELINE_VERSION. A rebuild only compiles sources whose
+bytes changed, and it spreads those across a process pool. The app reads
+fragments through the same cache (fragment()), so an unchanged piece is
+never converted at render time.
+"""
+import argparse
+import hashlib
+import html
+import os
+import re
+import time
+from collections import namedtuple
+
+from search import SAMPLES_DIR, sample_paths
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT, ".cache", "prose")
+
+# Bump to invalidate every cached fragment when the converter's output changes
+PIPELINE_VERSION = "1"
+# Fewer misses than this are compiled in-process; a pool costs more to start
+POOL_THRESHOLD = 8
+
+SAFE_SCHEMES = ("http:", "https:", "mailto:")
+# Everything render_markdown() can emit; TAG_MARKUP keeps their CSS rules
+# from being pruned (stylesheet.py only sees the static page markup)
+TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "em", "strong", "code", "pre", "a", "img",
+        "ul", "ol", "li", "blockquote", "hr", "br")
+TAG_MARKUP = "".join(f"<{tag}>" for tag in TAGS)
+
+Fragment = namedtuple("Fragment", ["source", "digest", "html"])
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+BULLET = re.compile(r"^\s*[-*+]\s+(.*)$")
+NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+CODE_SPAN = re.compile(r"`([^`]+)`")
+IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)(?:\s+&quot;([^&]*)&quot;)?\)")
+LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)(?:\s+&quot;([^&]*)&quot;)?\)")
+STRONG = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*|\b__(?=\S)(.+?)(?<=\S)__\b")
+EMPHASIS = re.compile(r"\*(?=\S)(.+?)(?<=\S)\*|\b_(?=\S)(.+?)(?<=\S)_\b")
+PLACEHOLDER = re.compile("\x00(\\d+)\x00")
+
+
+def safe_url(url):
+    """Return `url` (already HTML-escaped) if it is relative or uses a safe scheme, else None."""
+    # Browsers ignore control characters and whitespace inside a scheme ("java\tscript:")
+    plain = re.sub(r"[\x00-\x20\x7f]", "", html.unescape(url))
+    scheme = re.match(r"^([a-zA-Z][a-zA-Z0-9+.-]*):", plain)
+    if scheme and not plain.lower().startswith(SAFE_SCHEMES):
+        return None
+    return url
+
+
+def inline(text):
+    """Convert inline Markdown in one block of source text to HTML."""
+    text = html.escape(text.replace("\x00", "\ufffd"))
+    # Code spans and URLs are set aside so emphasis markers inside them survive
+    held = []
+
+    def hold(markup):
+        held.append(markup)
+        return f"\x00{len(held) - 1}\x00"
+
+    text = CODE_SPAN.sub(lambda m: hold(f"<code>{m.group(1)}</code>"), text)
+
+    def image(m):
+        alt, url, title = m.groups()
+        if safe_url(url) is None:
+            return alt
+        title = f' title="{title}"' if title else ""
+        return hold(f'<img src="{url}" alt="{alt}"{title} loading="lazy" decoding="async">')
+
+    def link(m):
+        label, url, title = m.groups()
+        if safe_url(url) is None:
+            return label
+        title = f' title="{title}"' if title else ""
+        return hold(f'<a href="{url}"{title}>') + label + hold("</a>")
+
+    text = LINK.sub(link, IMAGE.sub(image, text))
+    text = STRONG.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+    text = EMPHASIS.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+    text = text.replace("  \n", "<br>").replace("\n", " ")
+    return PLACEHOLDER.sub(lambda m: held[int(m.group(1))], text)
+
+
+def render_markdown(source):
+    """Convert a Markdown document to a sanitized HTML fragment."""
+    lines = source.replace("\r\n", "\n").split("\n")
+    out = []
+    paragraph, items, quote = [], [], []
+    list_tag = None
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            out.append(f"<p>{inline(chr(10).join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            out.append(f"<{list_tag}>" + "".join(f"<li>{inline(item)}</li>" for item in items) + f"</{list_tag}>")
+            items.clear()
+            list_tag = None
+        if quote:
+            out.append(f"<blockquote>{render_markdown(chr(10).join(quote))}</blockquote>")
+            quote.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = FENCE.match(line)
+        if fence:
+            flush()
+            end = next((j for j in range(i + 1, len(lines)) if lines[j].strip().startswith(fence.group(1))), len(lines))
+            out.append(f"<pre><code>{html.escape(chr(10).join(lines[i + 1:end]))}</code></pre>")
+            i = end + 1
+            continue
+        i += 1
+        if not line.strip():
+            flush()
+            continue
+        if line.lstrip().startswith(">"):
+            if not quote:
+                flush()
+            quote.append(line.lstrip()[1:].removeprefix(" "))
+            continue
+        if quote:
+            flush()
+        heading = HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{inline(heading.group(2))}</h{level}>")
+            continue
+        if RULE.match(line):
+            flush()
+            out.append("<hr>")
+            continue
+        bullet, numbered = BULLET.match(line), NUMBERED.match(line)
+        if bullet or numbered:
+            tag = "ul" if bullet else "ol"
+            if paragraph or (items and tag != list_tag):
+                flush()
+            list_tag = tag
+            items.append((bullet or numbered).group(1))
+            continue
+        if items and line.startswith((" ", "\t")):
+            items[-1] += "\n" + line.strip()
+            continue
+        if items:
+            flush()
+        paragraph.append(line.strip() if not line.endswith("  ") else line.lstrip())
+    flush()
+    return "\n".join(out)
+
+
+def source_digest(data):
+    return hashlib.sha256(PIPELINE_VERSION.encode() + b"\0" + data).hexdigest()
+
+
+def _cache_path(digest, cache_dir):
+    return os.path.join(cache_dir, digest[:2], f"{digest}.html")
+
+
+def _store(path, markup):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(markup)
+    os.replace(tmp, path)
+
+
+def compile_sources(paths, cache_dir=CACHE_DIR, workers=None):
+    """Compile every Markdown file in `paths`, reusing cached fragments.
+
+    Returns ({path: Fragment}, number of sources compiled). Misses are
+    converted across a process pool once there are POOL_THRESHOLD of them.
+    """
+    fragments, misses = {}, []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = source_digest(data)
+        try:
+            with open(_cache_path(digest, cache_dir), encoding="utf-8") as f:
+                fragments[path] = Fragment(path, digest, f.read())
+        except FileNotFoundError:
+            misses.append((path, digest, data.decode("utf-8")))
+    sources = [source for _, _, source in misses]
+    if len(misses) >= POOL_THRESHOLD and workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            compiled = list(pool.map(render_markdown, sources, chunksize=max(1, len(sources) // 32)))
+    else:
+        compiled = [render_markdown(source) for source in sources]
+    for (path, digest, _), markup in zip(misses, compiled):
+        _store(_cache_path(digest, cache_dir), markup)
+        fragments[path] = Fragment(path, digest, markup)
+    return {path: fragments[path] for path in paths}, len(misses)
+
+
+def fragment(path, cache_dir=CACHE_DIR):
+    """The compiled fragment for one source, compiling (and caching) it on a miss."""
+    fragments, _ = compile_sources([path], cache_dir, workers=1)
+    return fragments[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Markdown files (default: content/samples/*.md)")
+    parser.add_argument("--cache", default=CACHE_DIR, help="fragment cache (default: .cache/prose)")
+    parser.add_argument("--workers", type=int, default=None, help="compiler processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    paths = args.paths or sample_paths(SAMPLES_DIR)
+    start = time.perf_counter()
+    fragments, compiled = compile_sources(paths, args.cache, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(fragments)} pieces, {compiled} compiled, {len(fragments) - compiled} cached, {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
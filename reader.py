@@ -0,0 +1,141 @@
+"""Paginated reader for long manuscripts, backed by memory-mapped files.
+
+    python reader.py whispering-pines        # print the table of contents
+    python reader.py whispering-pines 3      # print page 3
+
+Manuscripts are Markdown files under content/manuscripts, named after their
+project: "# Title", "## Chapter" headings and paragraphs separated by blank
+lines (LF or CRLF). A Manuscript memory-maps its file and scans it once for
+paragraph boundaries, keeping only byte offsets (two integers per paragraph)
+and the page breaks derived from them. Reading a page decodes just that
+page's paragraphs from the map, so the memory a reader costs does not grow
+with the length of the book.
+"""
+import argparse
+import mmap
+import os
+import re
+from array import array
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANUSCRIPTS_DIR = os.path.join(ROOT, "content", "manuscripts")
+
+# Paragraphs are never split, so a page can run over by at most one paragraph
+PAGE_BYTES = 1800
+
+Chapter = namedtuple("Chapter", ["title", "page"])
+Paragraph = namedtuple("Paragraph", ["heading", "text"])
+
+# A blank line, with LF or CRLF line endings
+BLANK_LINE = re.compile(rb"\r?\n[ \t]*\r?\n")
+
+
+def manuscript_path(project_id, manuscripts_dir=MANUSCRIPTS_DIR):
+    """Path of the manuscript for `project_id`, or None if it has none."""
+    path = os.path.join(manuscripts_dir, f"{os.path.basename(project_id)}.md")
+    return path if os.path.isfile(path) else None
+
+
+def _heading_level(buf, start):
+    if buf[start:start + 3] == b"## ":
+        return 2
+    if buf[start:start + 2] == b"# ":
+        return 1
+    return 0
+
+
+class Manuscript:
+    """A manuscript file split into pages of whole paragraphs."""
+
+    def __init__(self, path, page_bytes=PAGE_BYTES):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        self.starts, self.ends = array("Q"), array("Q")
+        self.pages = array("I")
+        self.chapters = []
+        self.title = os.path.splitext(os.path.basename(path))[0]
+        self._scan(page_bytes)
+
+    def _scan(self, page_bytes):
+        buf, size = self._map, len(self._map)
+        pos = 0
+        page_size = 0
+        while pos < size:
+            # Skip the blank lines between paragraphs
+            while pos < size and buf[pos:pos + 1] in (b"\n", b"\r", b" ", b"\t"):
+                pos += 1
+            if pos >= size:
+                break
+            blank = BLANK_LINE.search(buf, pos)
+            end = blank.start() if blank else size
+            level = _heading_level(buf, pos)
+            if level == 1:
+                self.title = buf[pos + 2:end].decode("utf-8").strip()
+                pos = end
+                continue
+            number = len(self.starts)
+            # Chapters start on a fresh page; otherwise fill pages up to page_bytes
+            if not self.pages or level == 2 or (page_size and page_size + end - pos > page_bytes):
+                self.pages.append(number)
+                page_size = 0
+            if level == 2:
+                self.chapters.append(Chapter(buf[pos + 3:end].decode("utf-8").strip(), len(self.pages)))
+            self.starts.append(pos)
+            self.ends.append(end)
+            page_size += end - pos
+            pos = end
+
+    def __len__(self):
+        """Number of pages."""
+        return len(self.pages)
+
+    def page(self, number):
+        """Return the paragraphs on 1-based page `number` (clamped to the book)."""
+        number = min(max(1, number), len(self.pages)) if self.pages else 0
+        if not number:
+            return []
+        first = self.pages[number - 1]
+        last = self.pages[number] if number < len(self.pages) else len(self.starts)
+        paragraphs = []
+        for i in range(first, last):
+            text = self._map[self.starts[i]:self.ends[i]].decode("utf-8").strip()
+            heading = text.startswith("## ")
+            paragraphs.append(Paragraph(heading, text[3:].strip() if heading else " ".join(text.split())))
+        return paragraphs
+
+    def chapter_at(self, number):
+        """Title of the chapter page `number` belongs to, or ""."""
+        title = ""
+        for chapter in self.chapters:
+            if chapter.page > number:
+                break
+            title = chapter.title
+        return title
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("project", help="project id, e.g. whispering-pines")
+    parser.add_argument("page", nargs="?", type=int, help="page to print (default: table of contents)")
+    args = parser.parse_args(argv)
+    path = manuscript_path(args.project)
+    if path is None:
+        parser.error(f"no manuscript for {args.project!r} in {MANUSCRIPTS_DIR}")
+    book = Manuscript(path)
+    if args.page is None:
+        print(f"{book.title}: {len(book)} pages, {len(book.starts)} paragraphs")
+        for chapter in book.chapters:
+            print(f"  p. {chapter.page:>3}  {chapter.title}")
+        return
+    for paragraph in book.page(args.page):
+        print(f"## {paragraph.text}" if paragraph.heading else paragraph.text, end="\n\n")
+
+
+if __name__ == "__main__":
+    main()
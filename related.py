@@ -0,0 +1,168 @@
+""""Related pieces" for each project card, from TF-IDF similarity.
+
+    python related.py            # (re)builds .cache/related.npy
+    python related.py --show     # builds, then prints each project's neighbours
+
+Every project is described by its title, summary and tags plus the text of
+its writing samples (content/samples/<project>*.md). At build time these are
+turned into L2-normalised TF-IDF vectors with NumPy, the whole cosine
+similarity matrix is computed in one product, and the TOP_K nearest
+neighbours of every project are saved as an int32 matrix in .npy format
+(-1 pads rows with fewer neighbours). Project ids are saved next to it in
+related.json.
+
+The app only memory-maps that file: the .npy header is parsed with the
+standard library and rows are sliced from a memoryview, so a lookup is one
+array slice and NumPy is never imported at startup. np.load(path,
+mmap_mode="r") reads the same file. Like images.py and fonts.py this is a
+build step; export.py and watch.py run it, and the app shows no strips until
+it has been built.
+"""
+import argparse
+import ast
+import json
+import mmap
+import os
+import sys
+from collections import Counter
+
+from catalog import CATALOG_PATH, read_projects
+from search import SAMPLES_DIR, sample_paths, tokenize
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MATRIX_PATH = os.path.join(ROOT, ".cache", "related.npy")
+
+TOP_K = 3
+# Tags are strong topical signals, so each counts as this many occurrences
+TAG_WEIGHT = 3
+# Neighbours less similar than this are left out rather than shown as "related"
+MIN_SIMILARITY = 0.02
+
+NPY_MAGIC = b"\x93NUMPY"
+
+
+def ids_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def project_terms(projects, samples_dir=SAMPLES_DIR):
+    """Term counts per project: title, summary, tags and the project's samples."""
+    samples = {}
+    for path in sample_paths(samples_dir):
+        project = os.path.splitext(os.path.basename(path))[0].partition("--")[0]
+        with open(path, encoding="utf-8") as f:
+            samples.setdefault(project, []).append(f.read())
+    terms = []
+    for project in projects:
+        counts = Counter(tokenize(" ".join([project.title, project.summary, *samples.get(project.id, ())])))
+        for tag in project.tags:
+            counts[f"tag:{tag.lower()}"] += TAG_WEIGHT
+        terms.append(counts)
+    return terms
+
+
+def build_related(catalog_path=CATALOG_PATH, samples_dir=SAMPLES_DIR, path=MATRIX_PATH, k=TOP_K):
+    """Compute every project's top-`k` neighbours and save them to `path`; returns {id: ids}."""
+    import numpy as np
+
+    projects, _ = read_projects(catalog_path)
+    terms = project_terms(projects, samples_dir)
+    vocabulary = {term: i for i, term in enumerate(sorted(set().union(*terms)))}
+    n, k = len(projects), max(0, min(k, len(projects) - 1))
+
+    tf = np.zeros((n, len(vocabulary)), dtype=np.float32)
+    rows = np.repeat(np.arange(n), [len(counts) for counts in terms])
+    columns = np.fromiter((vocabulary[term] for counts in terms for term in counts), dtype=np.intp, count=len(rows))
+    tf[rows, columns] = np.fromiter((c for counts in terms for c in counts.values()), dtype=np.float32, count=len(rows))
+    # Sublinear term frequency and smoothed inverse document frequency
+    tf = np.log1p(tf)
+    idf = np.log((1 + n) / (1 + np.count_nonzero(tf, axis=0))) + 1
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1, norms)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, -np.inf)
+    # Partition out the k best per row, then order just those
+    top = np.argpartition(-similarity, k - 1, axis=1)[:, :k] if k else np.zeros((n, 0), dtype=np.intp)
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(similarity, top, axis=1), axis=1), axis=1)
+    top[np.take_along_axis(similarity, top, axis=1) < MIN_SIMILARITY] = -1
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, top.astype("<i4"))
+    os.replace(tmp, path)
+    ids = [project.id for project in projects]
+    with open(ids_path(path), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids}, f)
+    return {ids[row]: tuple(ids[j] for j in top[row] if j >= 0) for row in range(n)}
+
+
+def _npy_header(buf):
+    """Return (descr, fortran_order, shape, data offset) of an .npy file."""
+    if buf[:6] != NPY_MAGIC:
+        raise ValueError("not an .npy file")
+    major = buf[6]
+    if major == 1:
+        length, start = int.from_bytes(buf[8:10], "little"), 10
+    else:
+        length, start = int.from_bytes(buf[8:12], "little"), 12
+    header = ast.literal_eval(buf[start:start + length].decode("latin-1"))
+    return header["descr"], header["fortran_order"], header["shape"], start + length
+
+
+class RelatedIndex:
+    """Read-only view of a built neighbour matrix, keyed by project id."""
+
+    def __init__(self, path=MATRIX_PATH):
+        with open(ids_path(path), encoding="utf-8") as f:
+            self.ids = json.load(f)["ids"]
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        descr, fortran_order, shape, offset = _npy_header(self._map)
+        if descr != "<i4" or fortran_order or len(shape) != 2 or sys.byteorder != "little":
+            self._map.close()
+            raise ValueError(f"{path} is not a little-endian int32 matrix")
+        rows, self.k = shape
+        if rows != len(self.ids):
+            self._map.close()
+            raise ValueError(f"{path} does not match {ids_path(path)}")
+        self._rows = memoryview(self._map)[offset:offset + rows * self.k * 4].cast("i")
+        self._row = {project_id: row for row, project_id in enumerate(self.ids)}
+
+    def get(self, project_id, default=()):
+        """Ids of the projects related to `project_id`, most similar first."""
+        row = self._row.get(project_id)
+        if row is None:
+            return default
+        return tuple(self.ids[j] for j in self._rows[row * self.k:(row + 1) * self.k] if j >= 0)
+
+    def close(self):
+        self._rows.release()
+        self._map.close()
+
+
+def load_related(path=MATRIX_PATH):
+    """Open the built matrix, or return None if it has not been built (or is unreadable)."""
+    try:
+        return RelatedIndex(path)
+    except (FileNotFoundError, ValueError, KeyError, SyntaxError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=MATRIX_PATH, help="matrix file (default: .cache/related.npy)")
+    parser.add_argument("-k", type=int, default=TOP_K, help="neighbours per project")
+    parser.add_argument("--show", action="store_true", help="print the neighbours after building")
+    args = parser.parse_args(argv)
+    related = build_related(path=args.out, k=args.k)
+    print(f"Wrote {args.out}: {len(related)} projects, up to {args.k} neighbours each")
+    if args.show:
+        for project_id, neighbours in related.items():
+            print(f"  {project_id}: {', '.join(neighbours) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Full-text search over the writing samples, ranked with BM25.
+
+    python search.py                     # (re)builds .cache/search.idx
+    python search.py "ocean floor maps"  # builds if needed, then queries
+
+Samples are Markdown files under content/samples, one piece per file, named
+after the project they belong to (hidden-europe.md, or hidden-europe--part-4.md
+for several pieces of one project). They are tokenized once into a compact
+binary inverted index:
+
+    header    magic, version, document and term counts, average length,
+              section offsets
+    documents JSON: id, project, title, length and excerpt per document
+    terms     sorted term table (fixed-size records) + the term bytes
+    postings  (document, term frequency) pairs, grouped by term
+
+The app memory-maps the file, so startup reads only the header and document
+table; a query binary-searches the term table and reads the postings of its
+own terms, without touching the sample text.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from collections import Counter, namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SAMPLES_DIR = os.path.join(ROOT, "content", "samples")
+INDEX_PATH = os.path.join(ROOT, ".cache", "search.idx")
+
+MAGIC = b"BM25"
+VERSION = 1
+# magic, version, documents, terms, average length, sources digest,
+# offsets of the documents / term table / term bytes / postings sections
+HEADER = struct.Struct("<4sHxxIIf32sQQQQ")
+TERM = struct.Struct("<IIII")  # term bytes offset, term length, first posting, document frequency
+POSTING = struct.Struct("<II")  # document, term frequency
+
+K1 = 1.2
+B = 0.75
+EXCERPT_LENGTH = 220
+
+WORD = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i if in into is it its "
+    "of on or our she so than that the their them then there they this to was we were what "
+    "when which who will with you your".split()
+)
+
+Document = namedtuple("Document", ["id", "project", "title", "length", "excerpt"])
+Hit = namedtuple("Hit", ["document", "score"])
+
+
+def tokenize(text):
+    """Lower-cased word tokens with common English stopwords removed."""
+    return [token for token in WORD.findall(text.lower()) if token not in STOPWORDS]
+
+
+def sample_paths(samples_dir=SAMPLES_DIR):
+    try:
+        names = sorted(name for name in os.listdir(samples_dir) if name.endswith(".md"))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(samples_dir, name) for name in names]
+
+
+def sources_digest(paths):
+    """Cheap change detector for the samples: names, sizes and mtimes, not content."""
+    h = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        h.update(f"{os.path.basename(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return h.digest()
+
+
+def _plain(line):
+    return re.sub(r"[*_`#>\[\]]", "", line).strip()
+
+
+def parse_sample(path):
+    """Return (Document without length, full text) for one Markdown sample."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    doc_id = os.path.splitext(os.path.basename(path))[0]
+    title, excerpt = doc_id, ""
+    for block in text.split("\n\n"):
+        block = block.strip()
+        if block.startswith("# ") and title == doc_id:
+            title = _plain(block.splitlines()[0])
+        elif block and not block.startswith(("#", "*")) and not excerpt:
+            excerpt = _plain(" ".join(block.split()))
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(" ", 1)[0] + "…"
+    return Document(doc_id, doc_id.partition("--")[0], title, 0, excerpt), text
+
+
+def build_index(samples_dir=SAMPLES_DIR, path=INDEX_PATH):
+    """Tokenize every sample and write the index to `path`; returns the document count."""
+    paths = sample_paths(samples_dir)
+    documents, postings = [], {}
+    for number, sample in enumerate(paths):
+        document, text = parse_sample(sample)
+        # The title is indexed with the body so a search for it finds the piece
+        tokens = tokenize(document.title + "\n" + text)
+        documents.append(document._replace(length=len(tokens)))
+        for term, freq in Counter(tokens).items():
+            postings.setdefault(term, []).append((number, freq))
+
+    terms = sorted(postings)
+    term_bytes = bytearray()
+    table = bytearray()
+    posting_bytes = bytearray()
+    for term in terms:
+        encoded = term.encode("utf-8")
+        table += TERM.pack(len(term_bytes), len(encoded), len(posting_bytes) // POSTING.size, len(postings[term]))
+        term_bytes += encoded
+        for posting in postings[term]:
+            posting_bytes += POSTING.pack(*posting)
+
+    docs_json = json.dumps([d._asdict() for d in documents], separators=(",", ":")).encode("utf-8")
+    average = sum(d.length for d in documents) / len(documents) if documents else 0.0
+    docs_offset = HEADER.size
+    table_offset = docs_offset + len(docs_json)
+    terms_offset = table_offset + len(table)
+    postings_offset = terms_offset + len(term_bytes)
+    header = HEADER.pack(
+        MAGIC, VERSION, len(documents), len(terms), average, sources_digest(paths),
+        docs_offset, table_offset, terms_offset, postings_offset,
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for part in (header, docs_json, table, term_bytes, posting_bytes):
+            f.write(part)
+    os.replace(tmp, path)
+    return len(documents)
+
+
+class SearchIndex:
+    """Read-only BM25 index over a memory-mapped index file."""
+
+    def __init__(self, path=INDEX_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.n_docs, self.n_terms, self.average_length, self.digest,
+         docs_offset, self._table, self._terms, self._postings) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} search index")
+        self.documents = [Document(**d) for d in json.loads(self._map[docs_offset:self._table])]
+
+    def __len__(self):
+        return self.n_docs
+
+    def _lookup(self, term):
+        """Binary-search the term table; returns (first posting, document frequency)."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, first, df = TERM.unpack_from(self._map, self._table + mid * TERM.size)
+            start = self._terms + offset
+            found = self._map[start:start + length]
+            if found == key:
+                return first, df
+            if found < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def postings(self, term):
+        """Yield (document number, term frequency) for `term`."""
+        entry = self._lookup(term)
+        if entry is None:
+            return
+        first, df = entry
+        yield from POSTING.iter_unpack(self._map[self._postings + first * POSTING.size:
+                                                 self._postings + (first + df) * POSTING.size])
+
+    def search(self, query, limit=10):
+        """Rank documents for `query` with BM25; returns up to `limit` Hits, best first."""
+        scores = {}
+        for term in set(tokenize(query)):
+            entry = self._lookup(term)
+            if entry is None:
+                continue
+            df = entry[1]
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            for number, freq in self.postings(term):
+                norm = K1 * (1 - B + B * self.documents[number].length / self.average_length)
+                scores[number] = scores.get(number, 0.0) + idf * freq * (K1 + 1) / (freq + norm)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [Hit(self.documents[number], score) for number, score in best]
+
+    def close(self):
+        self._map.close()
+
+
+def open_index(samples_dir=SAMPLES_DIR, path=INDEX_PATH):
+    """Open the index, rebuilding it first if the samples changed since it was written."""
+    current = sources_digest(sample_paths(samples_dir))
+    try:
+        index = SearchIndex(path)
+    except (FileNotFoundError, ValueError, struct.error):
+        index = None
+    if index is not None and index.digest == current:
+        return index
+    if index is not None:
+        index.close()
+    build_index(samples_dir, path)
+    return SearchIndex(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="?", help="search the index instead of just building it")
+    parser.add_argument("--samples", default=SAMPLES_DIR, help="samples directory (default: content/samples)")
+    parser.add_argument("--index", default=INDEX_PATH, help="index file (default: .cache/search.idx)")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+    if args.query is None:
+        count = build_index(args.samples, args.index)
+        print(f"Indexed {count} samples into {args.index} ({os.path.getsize(args.index):,} bytes)")
+        return
+    index = open_index(args.samples, args.index)
+    start = time.perf_counter()
+    hits = index.search(args.query, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for hit in hits:
+        print(f"{hit.score:7.3f}  {hit.document.title}  [{hit.document.id}]")
+    print(f"{len(hits)} results in {elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
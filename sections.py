@@ -0,0 +1,187 @@
+"""Static content for the portfolio page.
+
+All page sections are rendered here so that portfolio.py (the Streamlit app)
+and export.py (the static bundle builder) emit exactly the same markup. The
+page sections are templates in assets/templates filled from content/site.json
+(see templates.py); the styles are in assets/css/portfolio.css (see
+stylesheet.py).
+"""
+import html
+import re
+from urllib.parse import quote
+
+from markupsafe import Markup
+
+from catalog import ALL
+from templates import load_site, render
+
+PAGE_TITLE = "Jerim Owino - Writing Portfolio"
+PAGE_ICON = "✍️"
+
+FONT_AWESOME_URL = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css"
+
+
+# Each section function takes an optional parsed site.json as `site`
+def header_section(site=None):
+    return render("header.html", site)
+
+
+def hero_section(site=None):
+    return render("hero.html", site)
+
+
+# About Section
+ABOUT_IMAGE = "https://images.unsplash.com/photo-1543269865-cbf427effbad?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=1770&q=80"
+
+# Full width once the about section stacks, half the container beside the text
+ABOUT_SIZES = "(max-width: 992px) 90vw, 600px"
+
+CV_FILENAME = "Jerim-Owino-CV.pdf"
+
+
+def about_section(images=None, cv_url=None, site=None):
+    """Render the about section; `cv_url` is the built CV (see cv.py), if any."""
+    site = load_site() if site is None else site
+    alt = f"{site['name']['first']} {site['name']['last']}"
+    if images is not None:
+        image = images.img_html(ABOUT_IMAGE, alt, ABOUT_SIZES)
+    else:
+        image = f'<img src="{html.escape(ABOUT_IMAGE)}" alt="{html.escape(alt)}" loading="lazy" decoding="async">'
+    return render(
+        "about.html", site, image=Markup(image), cv_url=cv_url or "#", cv_download=CV_FILENAME if cv_url else "",
+    )
+
+
+def skills_section(site=None):
+    return render("skills.html", site)
+
+
+def projects_section(catalog, site=None):
+    """Render the full projects section with every card, for the static page."""
+    return render(
+        "projects.html", site, filters=(ALL,) + catalog.filters, cards=Markup(catalog.cards_html(catalog.ids())),
+    )
+
+
+# The Streamlit app mounts the filter buttons as a component (see
+# project_filter.py), so it renders the heading and the card grid as two
+# blocks around it.
+def projects_heading(site=None):
+    return render("projects_heading.html", site)
+
+
+def projects_grid(cards_html, site=None):
+    return render("projects_grid.html", site, cards=Markup(cards_html))
+
+
+def contact_section(site=None):
+    return render("contact.html", site)
+
+
+def footer_section(site=None):
+    return render("footer.html", site)
+
+
+# Writing-sample search results, shown above the grid while a query is active
+SEARCH_RESULTS = """
+<section class="projects search-results">
+    <div class="container">
+        <p class="search-summary">{summary}</p>{results}
+    </div>
+</section>
+"""
+
+SEARCH_RESULT = """
+        <article class="search-result">
+            <h4><a href="?sample={id}">{title}</a></h4>
+            <p>{excerpt}</p>
+        </article>"""
+
+
+def search_results(query, hits, elapsed):
+    """Render search hits (search.Hit) for `query`, found in `elapsed` seconds."""
+    count = f"{len(hits)} result{'' if len(hits) == 1 else 's'}"
+    summary = f"{count} for “{html.escape(query)}” ({elapsed * 1000:.1f} ms)"
+    results = "".join(
+        SEARCH_RESULT.format(
+            id=quote(hit.document.id), title=html.escape(hit.document.title),
+            excerpt=html.escape(hit.document.excerpt),
+        )
+        for hit in hits
+    )
+    return SEARCH_RESULTS.format(summary=summary, results=results)
+
+# A full writing sample (compiled by prose.py), shown after the header while
+# ?sample=<document> is set
+SAMPLE = """
+<section id="sample" class="reader">
+    <div class="container">
+        <p class="reader-meta">Writing sample</p>
+        <article class="reader-page">
+{body}
+        </article>
+    </div>
+</section>
+"""
+
+# Manuscript reader, shown after the header while ?read=<project> is set
+READER = """
+<section id="reader" class="reader">
+    <div class="container">
+        <p class="reader-meta">{meta}</p>
+        <h2>{title}</h2>
+        <div class="reader-page">{paragraphs}
+        </div>
+    </div>
+</section>
+"""
+
+READER_HEADING = "\n            <h3>{}</h3>"
+READER_PARAGRAPH = "\n            <p>{}</p>"
+
+EMPHASIS = re.compile(r"\*([^*]+)\*")
+
+
+def reader_page(title, chapter, page, pages, paragraphs):
+    """Render one page of a manuscript; `paragraphs` are reader.Paragraph tuples.
+
+    An empty manuscript (no `pages`) gets a note instead of "Page 0 of 0".
+    """
+    body = "".join(
+        READER_HEADING.format(html.escape(p.text)) if p.heading
+        else READER_PARAGRAPH.format(EMPHASIS.sub(r"<em>\1</em>", html.escape(p.text)))
+        for p in paragraphs
+    )
+    if not pages:
+        meta = "Nothing to read here yet"
+    else:
+        meta = f"{html.escape(chapter)} · " if chapter else ""
+        meta += f"Page {page} of {pages}"
+    return READER.format(
+        meta=meta,
+        title=html.escape(title),
+        paragraphs=body,
+    )
+
+
+def stats_section(rows, daily, days):
+    """Render the analytics report: analytics.report() rows and daily_views() for `days` days."""
+    return render("stats.html", days=f"{days:g}", rows=rows, daily=daily)
+
+
+def render_sections(catalog, images=None, cv_url=None, site=None):
+    """Return the page sections in order, as (name, html) pairs.
+
+    `images` is an optional images.ImageManifest used for responsive markup,
+    `cv_url` the link for the Download CV button.
+    """
+    site = load_site() if site is None else site
+    return [
+        ("header", header_section(site)),
+        ("hero", hero_section(site)),
+        ("about", about_section(images, cv_url, site)),
+        ("skills", skills_section(site)),
+        ("projects", projects_section(catalog, site)),
+        ("contact", contact_section(site)),
+        ("footer", footer_section(site)),
+    ]
@@ -0,0 +1,228 @@
+"""Minimal ASGI server for the exported static bundle.
+
+    python export.py --out dist
+    python serve.py dist --port 8000          # or: uvicorn serve:app (serves ./dist)
+
+The bundle is indexed once at startup. Every file gets a strong ETag, and
+the gzip/Brotli variants written by export.py are picked by Accept-Encoding
+without compressing anything per request. Small files are answered from
+memory; large ones (images) are memory-mapped, or handed to the server via
+the ASGI pathsend extension when it supports sendfile. If-None-Match is
+answered with 304, and files listed in the asset manifest (see assets.py) are
+sent with `Cache-Control: immutable`.
+"""
+import argparse
+import hashlib
+import mimetypes
+import mmap
+import os
+from collections import namedtuple
+
+from assets import immutable_paths
+
+# Files up to this size are kept in memory; larger ones are memory-mapped
+MEMORY_LIMIT = 256 * 1024
+CHUNK_SIZE = 256 * 1024
+
+# Preference order when the client accepts several encodings
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+CONTENT_TYPES = {
+    ".webp": "image/webp",
+    ".woff2": "font/woff2",
+    ".js": "text/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+}
+
+Variant = namedtuple("Variant", ["path", "size", "etag", "body"])
+Entry = namedtuple("Entry", ["content_type", "cache_control", "variants"])
+
+
+def content_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def cache_control(url_path, immutable=frozenset()):
+    """Fingerprinted assets are cached forever, pages revalidated, the rest kept an hour."""
+    if url_path in immutable:
+        return "public, max-age=31536000, immutable"
+    if url_path.endswith(".html"):
+        return "no-cache"
+    return "public, max-age=3600"
+
+
+def _load_variant(path):
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size <= MEMORY_LIMIT:
+            body = f.read()
+            digest = hashlib.sha256(body).hexdigest()
+        else:
+            body = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            digest = hashlib.sha256(body).hexdigest()
+    return Variant(path, size, f'"{digest[:32]}"', body)
+
+
+def scan(root):
+    """Index every file under `root` by URL path, attaching its .br/.gz siblings."""
+    files = {}
+    immutable = immutable_paths(root)
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            if name.endswith((".br", ".gz")):
+                continue
+            path = os.path.join(dirpath, name)
+            url_path = "/" + os.path.relpath(path, root).replace(os.sep, "/")
+            variants = {None: _load_variant(path)}
+            for encoding, suffix in ENCODINGS:
+                if os.path.exists(path + suffix):
+                    variants[encoding] = _load_variant(path + suffix)
+            files[url_path] = Entry(content_type(path), cache_control(url_path, immutable), variants)
+    return files
+
+
+def accepted_encodings(value):
+    """Parse an Accept-Encoding header into the set of codings with q > 0."""
+    accepted = set()
+    for part in value.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, number = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    if "*" in accepted:
+        accepted.update(coding for coding, _ in ENCODINGS)
+    return accepted
+
+
+def etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class StaticApp:
+    """ASGI application serving one directory of pre-built files."""
+
+    def __init__(self, root):
+        self.root = root
+        self.files = scan(root)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._simple(send, 405, b"Method Not Allowed", [(b"allow", b"GET, HEAD")])
+            return
+        path = scope["path"]
+        if path.endswith("/"):
+            path += "index.html"
+        entry = self.files.get(path)
+        if entry is None:
+            await self._simple(send, 404, b"Not Found")
+            return
+
+        headers = {}
+        for name, value in scope["headers"]:
+            headers[name] = value.decode("latin-1")
+        variant, encoding = entry.variants[None], None
+        if len(entry.variants) > 1:
+            accepted = accepted_encodings(headers.get(b"accept-encoding", ""))
+            for coding, _ in ENCODINGS:
+                if coding in accepted and coding in entry.variants:
+                    variant, encoding = entry.variants[coding], coding
+                    break
+
+        response_headers = [
+            (b"etag", variant.etag.encode()),
+            (b"cache-control", entry.cache_control.encode()),
+        ]
+        if len(entry.variants) > 1:
+            response_headers.append((b"vary", b"Accept-Encoding"))
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match and etag_matches(if_none_match, variant.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": response_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        response_headers += [
+            (b"content-type", entry.content_type.encode()),
+            (b"content-length", str(variant.size).encode()),
+        ]
+        if encoding:
+            response_headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+        if method == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+        elif isinstance(variant.body, bytes):
+            await send({"type": "http.response.body", "body": variant.body})
+        elif "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(variant.path)})
+        else:
+            view = memoryview(variant.body)
+            for start in range(0, variant.size, CHUNK_SIZE):
+                chunk = view[start:start + CHUNK_SIZE]
+                await send({"type": "http.response.body", "body": bytes(chunk), "more_body": start + CHUNK_SIZE < variant.size})
+
+    async def _simple(self, send, status, body, headers=()):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(body)).encode()), *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class _LazyApp:
+    """Module-level `app` for `uvicorn serve:app`; indexes $PORTFOLIO_DIST (default dist) on first use."""
+
+    def __init__(self):
+        self._app = None
+
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            self._app = StaticApp(os.environ.get("PORTFOLIO_DIST", "dist"))
+        await self._app(scope, receive, send)
+
+
+app = _LazyApp()
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", nargs="?", default="dist", help="directory to serve (default: dist)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    args = parser.parse_args(argv)
+    if args.workers > 1:
+        os.environ["PORTFOLIO_DIST"] = args.root
+        uvicorn.run("serve:app", host=args.host, port=args.port, workers=args.workers, access_log=False)
+    else:
+        uvicorn.run(StaticApp(args.root), host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Local SMTP stand-in for testing contact-form delivery.
+
+    python smtp_sink.py --port 1025 --out .cache/mail
+    PORTFOLIO_SMTP_HOST=127.0.0.1 PORTFOLIO_SMTP_PORT=1025 streamlit run portfolio.py
+
+Accepts mail on localhost without authentication or TLS and writes each
+message to --out as a numbered .eml file (without --out it only logs).
+--fail-every N answers every Nth message with a transient 451 and --delay
+adds latency per message, to exercise the outbox worker's retries and
+batching. Connections and messages are logged, so connection reuse shows.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+
+class Sink:
+    def __init__(self, out_dir=None, fail_every=0, delay=0.0):
+        self.out_dir = out_dir
+        self.fail_every = fail_every
+        self.delay = delay
+        self.connections = itertools.count(1)
+        self.messages = itertools.count(1)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def log(self, text):
+        print(f"{time.strftime('%H:%M:%S')} {text}", flush=True)
+
+    async def handle(self, reader, writer):
+        connection = next(self.connections)
+        self.log(f"connection {connection} opened")
+
+        async def reply(line):
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        await reply("220 localhost portfolio SMTP sink")
+        sender, recipients = None, []
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("latin-1").strip()
+                verb = command[:4].upper()
+                if verb == "EHLO":
+                    await reply("250-localhost")
+                    await reply("250-8BITMIME")
+                    await reply("250 SMTPUTF8")
+                elif verb == "HELO":
+                    await reply("250 localhost")
+                elif verb == "MAIL":
+                    sender, recipients = command[10:].strip(), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command[8:].strip())
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    await reply(await self._deliver(connection, sender, recipients, data))
+                    sender, recipients = None, []
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.log(f"connection {connection} closed")
+
+    @staticmethod
+    async def _read_data(reader):
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+    async def _deliver(self, connection, sender, recipients, data):
+        number = next(self.messages)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_every and number % self.fail_every == 0:
+            self.log(f"message {number} on connection {connection}: rejected with 451")
+            return "451 Temporary failure, try again later"
+        if self.out_dir:
+            with open(os.path.join(self.out_dir, f"{number:06d}.eml"), "wb") as f:
+                f.write(data)
+        self.log(f"message {number} on connection {connection}: {sender} -> {', '.join(recipients)}, {len(data)} bytes")
+        return "250 OK queued"
+
+
+async def serve(host, port, sink):
+    server = await asyncio.start_server(sink.handle, host, port)
+    sink.log(f"listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--out", help="directory to write received messages to")
+    parser.add_argument("--fail-every", type=int, default=0, help="reject every Nth message with 451")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering DATA")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, Sink(args.out, args.fail_every, args.delay)))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
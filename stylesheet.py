@@ -0,0 +1,294 @@
+"""Stylesheet loading: minification, dead-rule pruning and critical CSS.
+
+Stylesheets are read from disk and cached by mtime. Each rule is checked
+against the markup that is actually rendered: selectors naming a class, id or
+tag that never appears are dropped, and so are rules left without selectors.
+What remains is split into the critical part (rules that match the above-the-
+fold markup, inlined first) and the deferred rest, both minified.
+
+@keyframes are kept only while a remaining rule names them in `animation` or
+`animation-name`, and go wherever they are used. Because the deferred block
+comes after the critical one, a critical rule that follows a deferred rule
+setting the same property repeats that declaration in the deferred block,
+so the later rule still wins as it does in the source.
+"""
+import functools
+import os
+import re
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CSS_PATH = os.path.join(ROOT, "assets", "css", "portfolio.css")
+
+# Classes on elements Streamlit renders itself, which never appear in our markup
+STREAMLIT_CLASSES = frozenset({"stApp", "stButton"})
+
+# At-rules whose bodies hold nested rules rather than declarations
+NESTED_AT_RULES = ("@media", "@supports", "@container", "@layer")
+KEYFRAMES = re.compile(r"@(?:-[a-z]+-)?keyframes\s+(\S+)")
+
+COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CLASS_ATTR = re.compile(r'\bclass="([^"]*)"')
+ID_ATTR = re.compile(r'\bid="([^"]*)"')
+TAG = re.compile(r"<([a-zA-Z][a-zA-Z0-9-]*)")
+PSEUDO = re.compile(r"::?[a-zA-Z-]+(\([^)]*\))?")
+ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+SEL_CLASS = re.compile(r"\.([\w-]+)")
+SEL_ID = re.compile(r"#([\w-]+)")
+SEL_TAG = re.compile(r"(?:^|[\s>+~])([a-zA-Z][\w-]*)")
+PROPERTY = re.compile(r"(?:^|;)\s*([-\w]+)\s*:")
+DECLARATION_END = re.compile(r";(?![^(]*\))")
+ANIMATION = re.compile(r"(?:^|;)\s*(?:-[a-z]+-)?animation(?:-name)?\s*:([^;]*)")
+
+
+def parse(css):
+    """Parse CSS into a list of (prelude, body) rules.
+
+    `body` is the declaration string for style rules, a nested rule list
+    for @media/@supports/@container/@layer blocks and @keyframes, and None
+    for statements such as @import or `@layer a, b;`.
+    """
+    rules, _ = _parse_block(COMMENT.sub("", css), 0)
+    return rules
+
+
+def _parse_block(css, i):
+    rules = []
+    n = len(css)
+    while i < n:
+        open_at = css.find("{", i)
+        close_at = css.find("}", i)
+        if close_at != -1 and (open_at == -1 or close_at < open_at):
+            return rules, close_at + 1
+        if open_at == -1:
+            break
+        prelude = " ".join(css[i:open_at].split())
+        semicolon = css.find(";", i, open_at)
+        if prelude.startswith("@") and semicolon != -1:
+            rules.append((" ".join(css[i:semicolon].split()), None))
+            i = semicolon + 1
+        elif prelude.startswith(NESTED_AT_RULES) or KEYFRAMES.match(prelude):
+            inner, i = _parse_block(css, open_at + 1)
+            rules.append((prelude, inner))
+        else:
+            end = css.index("}", open_at)
+            rules.append((prelude, css[open_at + 1:end]))
+            i = end + 1
+    return rules, n
+
+
+def markup_tokens(markup):
+    """Collect the class names, ids and tag names used in `markup`."""
+    classes = set(STREAMLIT_CLASSES)
+    for value in CLASS_ATTR.findall(markup):
+        classes.update(value.split())
+    ids = set(ID_ATTR.findall(markup))
+    tags = {tag.lower() for tag in TAG.findall(markup)} | {"html", "body"}
+    return frozenset(classes), frozenset(ids), frozenset(tags)
+
+
+def merge_tokens(token_sets):
+    """Union several markup_tokens() results, e.g. one per page fragment."""
+    classes, ids, tags = set(STREAMLIT_CLASSES), set(), {"html", "body"}
+    for fragment_classes, fragment_ids, fragment_tags in token_sets:
+        classes |= fragment_classes
+        ids |= fragment_ids
+        tags |= fragment_tags
+    return frozenset(classes), frozenset(ids), frozenset(tags)
+
+
+def selector_matches(selector, tokens):
+    """True if every class, id and tag in `selector` occurs in the markup."""
+    classes, ids, tags = tokens
+    bare = ATTRIBUTE.sub("", PSEUDO.sub("", selector))
+    return (
+        all(name in classes for name in SEL_CLASS.findall(bare))
+        and all(name in ids for name in SEL_ID.findall(bare))
+        and all(name.lower() in tags for name in SEL_TAG.findall(SEL_CLASS.sub("", SEL_ID.sub("", bare))))
+    )
+
+
+def prune(rules, tokens):
+    """Drop selectors that cannot match, rules with none left, and unused @keyframes."""
+    kept = _prune(rules, tokens)
+    return _keep_keyframes(kept, animation_names(kept))
+
+
+def _prune(rules, tokens):
+    kept = []
+    for prelude, body in rules:
+        if isinstance(body, list) and not KEYFRAMES.match(prelude):
+            inner = _prune(body, tokens)
+            if inner:
+                kept.append((prelude, inner))
+        elif prelude.startswith("@"):
+            kept.append((prelude, body))
+        else:
+            selectors = [s for s in _split_selectors(prelude) if selector_matches(s, tokens)]
+            if selectors:
+                kept.append((", ".join(selectors), body))
+    return kept
+
+
+def animation_names(rules):
+    """The identifiers used in animation / animation-name declarations of `rules`."""
+    names = set()
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if not KEYFRAMES.match(prelude):
+                names |= animation_names(body)
+        elif body:
+            for value in ANIMATION.findall(body):
+                names.update(re.findall(r"[-\w]+", value))
+    return names
+
+
+def _keep_keyframes(rules, names):
+    kept = []
+    for prelude, body in rules:
+        keyframes = KEYFRAMES.match(prelude)
+        if keyframes:
+            if keyframes.group(1) in names:
+                kept.append((prelude, body))
+        elif isinstance(body, list):
+            inner = _keep_keyframes(body, names)
+            if inner:
+                kept.append((prelude, inner))
+        else:
+            kept.append((prelude, body))
+    return kept
+
+
+def split(rules, tokens):
+    """Partition rules into (matching `tokens`, the rest), keeping source order.
+
+    A rule with some matching selectors is split between both halves. A
+    matching rule that follows a deferred one setting the same property is
+    repeated in the rest with those declarations, so the cascade order
+    survives the deferred block being loaded last. @keyframes go with the half whose rules use them.
+    """
+    matched, rest = _split(rules, tokens, set())
+    names = animation_names(matched)
+    return _keep_keyframes(matched, names), _keep_keyframes(rest, animation_names(rest) - names)
+
+
+def _split(rules, tokens, deferred):
+    matched, rest = [], []
+    for prelude, body in rules:
+        if KEYFRAMES.match(prelude):
+            matched.append((prelude, body))
+            rest.append((prelude, body))
+        elif isinstance(body, list):
+            inner_matched, inner_rest = _split(body, tokens, deferred)
+            if inner_matched:
+                matched.append((prelude, inner_matched))
+            if inner_rest:
+                rest.append((prelude, inner_rest))
+        elif prelude.startswith("@"):
+            matched.append((prelude, body))
+        else:
+            selectors = _split_selectors(prelude)
+            hits = [s for s in selectors if selector_matches(s, tokens)]
+            misses = [s for s in selectors if s not in hits]
+            properties = _properties(body)
+            if hits:
+                matched.append((", ".join(hits), body))
+                repeat = {s: _overrides(s, properties, deferred) for s in hits}
+                repeat = {s: names for s, names in repeat.items() if names}
+                if repeat:
+                    names = set().union(*repeat.values())
+                    declarations = [d for d in DECLARATION_END.split(body) if _properties(d) & names]
+                    rest.append((", ".join(repeat), ";".join(declarations)))
+            if misses:
+                rest.append((", ".join(misses), body))
+                for selector in misses:
+                    key, tag = specificity(selector), _subject_tag(selector)
+                    for name in properties:
+                        deferred.update({(name, key, tag), (name, key, "*")})
+    return matched, rest
+
+
+def _overrides(selector, properties, deferred):
+    """The `properties` on which `selector` may tie with an earlier deferred rule.
+
+    Only equal specificity is decided by source order, and rules whose
+    subjects are different tags can never style the same element.
+    """
+    key, tag = specificity(selector), _subject_tag(selector)
+    candidates = ("*",) if tag is None else (tag, None)
+    return {name for name in properties for candidate in candidates if (name, key, candidate) in deferred}
+
+
+def _subject_tag(selector):
+    compound = re.split(r"[\s>+~]+", ATTRIBUTE.sub("", PSEUDO.sub("", selector)).strip())[-1]
+    tag = re.match(r"[a-zA-Z][\w-]*", compound)
+    return tag.group(0).lower() if tag else None
+
+
+def _properties(body):
+    """Declared properties, reduced to their shorthand family (margin-top -> margin)."""
+    return {re.sub(r"^-[a-z]+-", "", name).split("-")[0] for name in PROPERTY.findall(body)}
+
+
+def specificity(selector):
+    """(ids, classes + attributes + pseudo-classes, tags + pseudo-elements) of a selector."""
+    pseudo_elements = len(re.findall(r"::[a-zA-Z-]+", selector))
+    pseudo_classes = len(PSEUDO.findall(selector)) - pseudo_elements
+    bare = ATTRIBUTE.sub("", PSEUDO.sub("", selector))
+    return (
+        len(SEL_ID.findall(bare)),
+        len(SEL_CLASS.findall(bare)) + len(ATTRIBUTE.findall(selector)) + pseudo_classes,
+        len(SEL_TAG.findall(SEL_CLASS.sub("", SEL_ID.sub("", bare)))) + pseudo_elements,
+    )
+
+
+def _split_selectors(prelude):
+    return [s.strip() for s in prelude.split(",") if s.strip()]
+
+
+def minify(rules):
+    """Serialize rules with all optional whitespace removed."""
+    out = []
+    for prelude, body in rules:
+        if body is None:
+            out.append(f"{prelude};")
+        elif isinstance(body, list):
+            prelude = re.sub(r"\s*:\s*", ":", prelude)
+            out.append(f"{prelude}{{{minify(body)}}}")
+        else:
+            prelude = re.sub(r"\s*([,>+~])\s*", r"\1", prelude)
+            body = re.sub(r"\s*([:;,])\s*", r"\1", " ".join(body.split())).rstrip(";")
+            out.append(f"{prelude}{{{body}}}")
+    return "".join(out)
+
+
+@functools.lru_cache(maxsize=16)
+def _read(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return parse(f.read())
+
+
+def load(path=CSS_PATH):
+    """Parse a stylesheet from disk, re-reading it only when its mtime changes."""
+    return _read(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=16)
+def _build(path, mtime, tokens, critical_tokens):
+    rules = prune(_read(path, mtime), tokens)
+    critical, deferred = split(rules, critical_tokens)
+    return minify(critical), minify(deferred)
+
+
+def build(path, markup, critical_markup):
+    """Return (critical_css, deferred_css) for a stylesheet.
+
+    Rules are pruned against `markup` (everything the page renders); those
+    that also match `critical_markup` (the above-the-fold sections) form the
+    critical part. Both parts are minified and cached until the file changes.
+    """
+    return build_tokens(path, markup_tokens(markup), markup_tokens(critical_markup))
+
+
+def build_tokens(path, tokens, critical_tokens):
+    """build() for markup already reduced to markup_tokens() results."""
+    return _build(path, os.path.getmtime(path), tokens, critical_tokens)
@@ -0,0 +1,74 @@
+"""Precompiled Jinja templates for the page sections.
+
+Section markup lives in assets/templates/<section>.html, and the copy it
+shows (names, contact address, hero and about text, skills, social links)
+lives in content/site.json. Changing a name or an email address is a data
+edit, and changing a card is an edit to card.html.
+
+Each template is compiled to a Python render function the first time it is
+used and then kept by the environment, so rendering a warm template is a
+plain function call (see benchmarks/bench_templates.py). The compiled code
+is also written to a bytecode cache in .cache/templates, so a fresh process
+loads it with marshal instead of parsing the template again. Autoescaping is
+on: data is escaped, and prerendered HTML (cards, <picture> markup) is
+passed in as markupsafe.Markup.
+"""
+import functools
+import json
+import os
+
+import jinja2
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(ROOT, "assets", "templates")
+SITE_PATH = os.path.join(ROOT, "content", "site.json")
+CACHE_DIR = os.path.join(ROOT, ".cache", "templates")
+
+
+@functools.lru_cache(maxsize=1)
+def environment():
+    """The shared Environment; templates are recompiled when their file changes."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(CACHE_DIR)
+    except OSError:  # read-only checkout: compile in memory only
+        bytecode_cache = None
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def template(name):
+    """The compiled template `name` (e.g. "hero.html")."""
+    return environment().get_template(name)
+
+
+def template_path(name):
+    """The source file of template `name`, for watching."""
+    return os.path.join(TEMPLATES_DIR, name)
+
+
+def sources_mtime():
+    """The latest change to site.json or any template, for keying caches of rendered HTML."""
+    paths = [SITE_PATH] + [entry.path for entry in os.scandir(TEMPLATES_DIR) if entry.name.endswith(".html")]
+    return max(os.path.getmtime(path) for path in paths)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_site(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_site(path=SITE_PATH):
+    """The parsed site.json, re-read only when its mtime changes."""
+    return _read_site(path, os.path.getmtime(path))
+
+
+def render(name, site=None, **context):
+    """Render template `name` with `site` (default: content/site.json) and `context`."""
+    return template(name).render(site=load_site() if site is None else site, **context)
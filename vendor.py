@@ -0,0 +1,469 @@
+"""Vendor the page's third-party files (Unsplash images, Font Awesome) into static/vendor.
+
+    python vendor.py                    # fetch what changed, revalidate the rest
+    python vendor.py --concurrency 16
+    python vendor.py --origin http://127.0.0.1:8001   # through http_origin.py
+
+collect_urls() finds every external file the page loads: <img> sources in
+the rendered sections, url() references in assets/css/portfolio.css, and the
+Font Awesome stylesheet. Stylesheets are followed, so the web fonts Font
+Awesome references are vendored as well.
+
+Fetching runs on asyncio with a small HTTP/1.1 client. Connections are kept
+alive and pooled per origin, with at most PER_HOST per origin and
+CONCURRENCY requests in flight overall. Connection errors, timeouts, 429 and
+5xx replies are retried with exponential backoff, honouring a numeric
+Retry-After. Each file's ETag and Last-Modified are kept in
+static/vendor/manifest.json, so a rerun sends conditional GETs and a 304
+leaves the local copy alone. A file that fails to fetch keeps its previous
+copy.
+
+Files are stored as static/vendor/<host>/<path>, which Streamlit serves under
+app/static/vendor/. A query string becomes a hash in the file name, and a
+missing extension is taken from the Content-Type. url() references inside
+vendored stylesheets are rewritten to the local copies (or, for a reference
+that failed to fetch, to its absolute remote URL). Nothing is fetched at
+runtime; the copies are used as follows:
+
+- images.py builds responsive variants of a vendored image as if it were
+  local, so the cards and the about photo stop loading from Unsplash;
+- VendorManifest.rewrite_css() points the page CSS at local copies;
+- the Font Awesome <link> (only emitted for icons the sprite lacks) points
+  at the vendored stylesheet.
+
+Without a manifest, every URL stays remote.
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import ssl
+import sys
+import time
+from collections import Counter, namedtuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VENDOR_DIR = os.path.join(ROOT, "static", "vendor")
+MANIFEST_NAME = "manifest.json"
+
+CONCURRENCY = 8
+PER_HOST = 4
+RETRIES = 3
+# Seconds; retry n waits RETRY_DELAY * 2**n (or Retry-After), capped at MAX_RETRY_DELAY
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 30
+TIMEOUT = 30
+MAX_REDIRECTS = 5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+USER_AGENT = "portfolio-vendor/1"
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")\s]+)\1\s*\)""")
+IMG_SRC = re.compile(r"""<img\b[^>]*?\ssrc="(https?://[^"]+)\"""")
+
+Response = namedtuple("Response", ["status", "headers", "body"])
+# `refs` maps the url() references written into a vendored stylesheet to the
+# remote URLs they stand for
+Entry = namedtuple("Entry", ["path", "kind", "content_type", "etag", "last_modified", "refs"])
+
+
+def is_remote(url):
+    return url.startswith(("http://", "https://"))
+
+
+def local_name(url, content_type=""):
+    """The path under VENDOR_DIR for `url`: <host>/<path>, the query hashed into the name."""
+    parts = urlsplit(url)
+    path = posixpath.normpath("/" + unquote(parts.path)).lstrip("/")
+    if not path or parts.path.endswith("/"):
+        path = posixpath.join(path, "index")
+    stem, ext = posixpath.splitext(path)
+    if parts.query:
+        stem += "-" + hashlib.sha256(parts.query.encode("utf-8")).hexdigest()[:10]
+    if not ext:
+        ext = mimetypes.guess_extension(content_type.partition(";")[0].strip()) or ""
+    return posixpath.join(parts.hostname, stem + ext)
+
+
+def css_refs(text, base_url):
+    """{reference as written: absolute URL} for the remote url() references in a stylesheet."""
+    refs = {}
+    for match in CSS_URL.finditer(text):
+        url = urljoin(base_url, match.group(2))
+        if is_remote(url):
+            refs[match.group(2)] = url
+    return refs
+
+
+def collect_urls():
+    """{url: kind} for every external file the page loads ("image" or "asset")."""
+    import stylesheet
+    from catalog import load_catalog
+    from sections import FONT_AWESOME_URL, render_sections
+
+    markup = "".join(section for _, section in render_sections(load_catalog()))
+    urls = {html.unescape(url): "image" for url in IMG_SRC.findall(markup)}
+    with open(stylesheet.CSS_PATH, encoding="utf-8") as f:
+        for url in css_refs(f.read(), "").values():
+            urls.setdefault(url, "asset")
+    urls[FONT_AWESOME_URL] = "asset"
+    return urls
+
+
+async def _read_response(reader):
+    """Read one response; returns (Response, whether the connection can be reused)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before a response")
+    version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+    status = int(status)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    if status in (204, 304) or status < 200:
+        body = b""
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        reusable = False
+    return Response(status, headers, body), reusable
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections, at most `per_host` per origin."""
+
+    def __init__(self, per_host=PER_HOST, timeout=TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = {}
+        self._slots = {}
+        self._ssl = None
+
+    async def _open(self, scheme, host, port):
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        connection = await asyncio.wait_for(asyncio.open_connection(host, port, ssl=context), self.timeout)
+        self.opened += 1
+        return connection
+
+    async def _exchange(self, origin, connection, message):
+        reader, writer = connection
+        try:
+            writer.write(message)
+            response, reusable = await asyncio.wait_for(_read_response(reader), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if reusable:
+            self._idle[origin].append(connection)
+        else:
+            writer.close()
+        return response
+
+    async def request(self, url, headers=()):
+        """GET `url` with extra `headers` (name, value) pairs; header names in the Response are lower case."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"not an http(s) URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        origin = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [
+            f"GET {target} HTTP/1.1",
+            f"Host: {parts.netloc.rpartition('@')[2]}",
+            f"User-Agent: {USER_AGENT}",
+            "Accept-Encoding: identity",
+            *(f"{name}: {value}" for name, value in headers),
+        ]
+        message = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        async with self._slots.setdefault(origin, asyncio.Semaphore(self.per_host)):
+            idle = self._idle.setdefault(origin, [])
+            while idle:
+                # The server may have closed an idle connection; fall through to a new one
+                try:
+                    return await self._exchange(origin, idle.pop(), message)
+                except (OSError, EOFError):
+                    pass
+            return await self._exchange(origin, await self._open(*origin), message)
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+def _retry_delay(attempt, response=None):
+    delay = RETRY_DELAY * 2 ** attempt
+    retry_after = response.headers.get("retry-after", "") if response is not None else ""
+    if retry_after.isdigit():
+        delay = int(retry_after)
+    return min(delay, MAX_RETRY_DELAY)
+
+
+async def _get(pool, url, headers, retries):
+    for attempt in range(retries + 1):
+        try:
+            response = await pool.request(url, headers)
+        except (OSError, EOFError) as exc:  # includes timeouts, TLS errors and short reads
+            if attempt == retries:
+                raise
+            delay = _retry_delay(attempt)
+        else:
+            if response.status not in RETRY_STATUSES or attempt == retries:
+                return response
+            delay = _retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+
+
+def _via(url, origin):
+    """`url` as fetched from a stand-in `origin`: <origin>/<host>/<path>?<query>."""
+    if origin is None:
+        return url
+    parts = urlsplit(url)
+    return f"{origin.rstrip('/')}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+async def fetch(pool, url, previous=None, retries=RETRIES, origin=None):
+    """GET `url`, conditional on a `previous` Entry, following redirects and retrying transient failures."""
+    headers = []
+    if previous is not None:
+        if previous.etag:
+            headers.append(("If-None-Match", previous.etag))
+        if previous.last_modified:
+            headers.append(("If-Modified-Since", previous.last_modified))
+    location = url
+    for _ in range(MAX_REDIRECTS + 1):
+        response = await _get(pool, _via(location, origin), headers, retries)
+        if response.status not in REDIRECT_STATUSES or "location" not in response.headers:
+            return response
+        location = urljoin(location, response.headers["location"])
+    raise ValueError(f"{url}: more than {MAX_REDIRECTS} redirects")
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(out_dir=VENDOR_DIR):
+    """The entries of a vendor manifest, {url: Entry}; empty if there is none."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            files = json.load(f)["files"]
+    except FileNotFoundError:
+        return {}
+    return {url: Entry(**entry) for url, entry in files.items()}
+
+
+def write_manifest(entries, out_dir=VENDOR_DIR):
+    data = {"files": {url: entry._asdict() for url, entry in sorted(entries.items())}}
+    _write(os.path.join(out_dir, MANIFEST_NAME), json.dumps(data, indent=2).encode("utf-8"))
+
+
+async def vendor(urls, out_dir=VENDOR_DIR, concurrency=CONCURRENCY, origin=None, pool=None):
+    """Fetch `urls` ({url: kind}), and what their stylesheets reference, into `out_dir`.
+
+    Returns (entries, counts): the new manifest entries, and a Counter of
+    files "fetched", "not modified" and "failed".
+    """
+    previous = read_manifest(out_dir)
+    pool = pool or ConnectionPool()
+    limit = asyncio.Semaphore(concurrency)
+    entries, counts, stylesheets = {}, Counter(), {}
+
+    async def one(url, kind):
+        old = previous.get(url)
+        if old is not None and not os.path.exists(os.path.join(out_dir, old.path)):
+            old = None
+        async with limit:
+            try:
+                return url, kind, old, await fetch(pool, url, old, origin=origin)
+            except (OSError, EOFError, ValueError) as exc:
+                return url, kind, old, exc
+
+    def failed(url, kind, old, reason):
+        """Record a failed fetch, keeping the previous copy if there is one."""
+        counts["failed"] += 1
+        print(f"  {url}: {reason}" + (" (keeping the previous copy)" if old else ""), flush=True)
+        if old is not None:
+            entries[url] = old._replace(kind=kind)
+            return list(old.refs.values())
+        return []
+
+    def store(url, kind, old, response):
+        """Record one result; returns the URLs it references."""
+        if isinstance(response, Response) and response.status == 304 and old is not None:
+            counts["not modified"] += 1
+            entries[url] = old._replace(kind=kind)
+            return list(old.refs.values())
+        if not isinstance(response, Response) or response.status != 200:
+            reason = response if not isinstance(response, Response) else f"HTTP {response.status}"
+            return failed(url, kind, old, reason)
+        content_type = response.headers.get("content-type", "")
+        entry = Entry(
+            local_name(url, content_type), kind, content_type,
+            response.headers.get("etag"), response.headers.get("last-modified"), {},
+        )
+        if content_type.startswith("text/css") or entry.path.endswith(".css"):
+            # An undecodable stylesheet counts as a failed fetch, so whatever
+            # references it keeps the absolute URL
+            try:
+                text = response.body.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                return failed(url, kind, old, f"not UTF-8 ({exc.reason} at byte {exc.start})")
+            counts["fetched"] += 1
+            entries[url] = entry
+            stylesheets[url] = (text, css_refs(text, url))
+            return list(stylesheets[url][1].values())
+        counts["fetched"] += 1
+        entries[url] = entry
+        _write(os.path.join(out_dir, entry.path), response.body)
+        return []
+
+    seen = set(urls)
+    tasks = {asyncio.ensure_future(one(url, kind)) for url, kind in urls.items()}
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for dep in store(*task.result()):
+                    if dep not in seen:
+                        seen.add(dep)
+                        tasks.add(asyncio.ensure_future(one(dep, "asset")))
+    finally:
+        await pool.close()
+
+    # Stylesheets are written once everything they reference has a local name.
+    # A reference that failed to fetch points at its absolute remote URL, as
+    # the relative one would be broken next to the local copy.
+    for url, (text, refs) in stylesheets.items():
+        entry = entries[url]
+        base = posixpath.dirname(entry.path)
+        targets = {
+            ref: posixpath.relpath(entries[dep].path, base) if dep in entries else dep for ref, dep in refs.items()
+        }
+        text = CSS_URL.sub(lambda m: f"url({targets[m.group(2)]})" if m.group(2) in targets else m.group(0), text)
+        _write(os.path.join(out_dir, entry.path), text.encode("utf-8"))
+        entries[url] = entry._replace(refs={targets[ref]: dep for ref, dep in refs.items()})
+    write_manifest(entries, out_dir)
+    return entries, counts
+
+
+@functools.lru_cache(maxsize=4)
+def _load_entries(out_dir, mtime):
+    return read_manifest(out_dir)
+
+
+def _manifest_mtime(out_dir):
+    try:
+        return os.path.getmtime(os.path.join(out_dir, MANIFEST_NAME))
+    except OSError:
+        return 0
+
+
+class VendorManifest:
+    """Remote URLs -> their vendored copies, for rewriting references at render time."""
+
+    def __init__(self, entries, out_dir=VENDOR_DIR, url_prefix="app/static/vendor"):
+        self.entries = entries
+        self.out_dir = out_dir
+        self.url_prefix = url_prefix.rstrip("/") + "/"
+
+    @classmethod
+    def load(cls, out_dir=VENDOR_DIR, url_prefix="app/static/vendor"):
+        """Read the manifest (again only when it changed); a missing one yields an empty manifest."""
+        return cls(_load_entries(out_dir, _manifest_mtime(out_dir)), out_dir, url_prefix)
+
+    def path(self, url):
+        """The local file for `url`, or None if it was not vendored."""
+        entry = self.entries.get(url)
+        return None if entry is None else os.path.join(self.out_dir, entry.path)
+
+    def url(self, url):
+        """The URL the app serves the vendored copy at, or `url` itself."""
+        entry = self.entries.get(url)
+        return url if entry is None else self.url_prefix + entry.path
+
+    def rewrite_css(self, css, url_for=None):
+        """Point url() references to vendored files at `url_for(url)` (default: self.url)."""
+        url_for = url_for or self.url
+        return CSS_URL.sub(lambda m: f"url({url_for(m.group(2))})" if m.group(2) in self.entries else m.group(0), css)
+
+    def publish(self, url, assets, prefix="vendor"):
+        """Write a vendored file (and what a stylesheet references) through an AssetManifest; returns its URL."""
+        entry = self.entries[url]
+        with open(self.path(url), "rb") as f:
+            data = f.read()
+        name = f"{prefix}/{entry.path}"
+        if entry.refs:
+            base = posixpath.dirname(name)
+            published = {
+                ref: posixpath.relpath(self.publish(dep, assets, prefix), base)
+                for ref, dep in entry.refs.items() if dep in self.entries
+            }
+            text = CSS_URL.sub(
+                lambda m: f"url({published[m.group(2)]})" if m.group(2) in published else m.group(0),
+                data.decode("utf-8"),
+            )
+            data = text.encode("utf-8")
+        return assets.add(name, data)
+
+
+def vendored_path(url, out_dir=VENDOR_DIR):
+    """The local copy of `url`, or None."""
+    return VendorManifest.load(out_dir).path(url)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=VENDOR_DIR, help="output directory (default: static/vendor)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="requests in flight (default: 8)")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="connections per origin (default: 4)")
+    parser.add_argument("--origin", help="fetch everything from this server as <origin>/<host>/<path> instead")
+    args = parser.parse_args(argv)
+    urls = collect_urls()
+    start = time.perf_counter()
+    pool = ConnectionPool(per_host=args.per_host)
+    entries, counts = asyncio.run(vendor(urls, args.out, args.concurrency, args.origin, pool))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(entries)} files in {args.out}: {counts['fetched']} fetched, {counts['not modified']} not modified, "
+        f"{counts['failed']} failed over {pool.opened} connections in {elapsed * 1000:.0f} ms"
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Incremental rebuilds of the exported site while content is being edited.
+
+    python watch.py                # build dist/, then rebuild on every change
+    python watch.py --out site
+    python serve.py dist           # in another terminal, to preview
+
+The export is split into named steps (vendored files, images, related
+pieces, catalog, site copy, each page section, icons, CSS, fonts, CV, the
+page itself), held in a Graph. While a step runs, the graph records which
+source files it reads and which other steps it uses. When a file changes,
+only the steps that read it are rerun. Their dependents are rerun only if
+the step's result actually changed. Editing one project blurb therefore
+rebuilds the catalog, the projects section, the pruned CSS and index.html,
+while the CV, fonts and images are left alone. Only new or changed output
+files are precompressed.
+
+Section templates (assets/templates) and content/site.json are watched like
+any other source. Python modules (sections.py, the stylesheet code) are not
+reloaded; restart the watcher after changing them.
+"""
+import argparse
+import os
+import time
+
+import export
+import fonts
+import stylesheet
+from assets import MANIFEST_NAME, AssetManifest, hashed_name
+from catalog import CATALOG_PATH, Catalog, read_projects, render_card
+from cv import ASSET_NAME as CV_ASSET, CV_PATH, build_cv
+from icons import inline_icons
+from images import ImageManifest, build_images, has_source, source_path
+from project_filter import static_script
+from related import build_related
+from search import SAMPLES_DIR, sample_paths
+from sections import (
+    ABOUT_IMAGE, FONT_AWESOME_URL, about_section, contact_section, footer_section, header_section, hero_section,
+    projects_section, skills_section,
+)
+from templates import SITE_PATH, load_site, template_path
+from vendor import MANIFEST_NAME as VENDOR_MANIFEST, VENDOR_DIR, VendorManifest
+
+# How often the watched files are stat()ed, in seconds
+POLL_INTERVAL = 0.1
+
+
+class Graph:
+    """Named build steps with dependencies discovered while they run.
+
+    Steps are registered in dependency order, so one pass over them in
+    registration order is a topological rebuild.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.values = {}
+        self.files = {}
+        self.deps = {}
+        self._dirty = set()
+        self._running = []
+
+    def step(self, name):
+        """Decorator registering `fn(graph)` as the step `name`."""
+        def register(fn):
+            self.steps[name] = fn
+            self._dirty.add(name)
+            return fn
+        return register
+
+    def get(self, name):
+        """The current result of step `name`, recorded as a dependency of the running step."""
+        if self._running:
+            self.deps[self._running[-1]].add(name)
+        return self.values[name]
+
+    def track(self, path):
+        """Record that the running step read `path`; returns `path`."""
+        self.files[self._running[-1]].add(path)
+        return path
+
+    def watched(self):
+        return set().union(*self.files.values())
+
+    def rebuild(self, changed=()):
+        """Rerun the steps affected by the `changed` paths; returns the names of the steps run.
+
+        A step that raises stays dirty, along with everything after it that
+        was due, so the next call picks up where this one failed.
+        """
+        changed = set(changed)
+        self._dirty.update(name for name, files in self.files.items() if files & changed)
+        ran = []
+        for name, build in self.steps.items():
+            if name not in self._dirty:
+                continue
+            self.files[name], self.deps[name] = set(), set()
+            self._running.append(name)
+            try:
+                value = build(self)
+            finally:
+                self._running.pop()
+            self._dirty.discard(name)
+            ran.append(name)
+            if name in self.values and self.values[name] == value:
+                continue
+            self.values[name] = value
+            self._dirty.update(step for step, deps in self.deps.items() if name in deps)
+        return ran
+
+
+class _Manifest(AssetManifest):
+    """An AssetManifest that remembers which files it newly wrote."""
+
+    def __init__(self, out_dir):
+        super().__init__(out_dir)
+        self.written = []
+
+    def add(self, name, data):
+        path = os.path.join(self.out_dir, hashed_name(name, data))
+        if not os.path.exists(path):
+            self.written.append(path)
+        return super().add(name, data)
+
+
+def site_graph(out_dir, workers=None):
+    """The export.py build as a Graph writing into `out_dir`.
+
+    `graph.assets.written` lists the files written by the last rebuild.
+    """
+    graph = Graph()
+    assets = graph.assets = _Manifest(out_dir)
+
+    @graph.step("projects")
+    def _(g):
+        projects, filters = read_projects(g.track(CATALOG_PATH))
+        return projects, filters
+
+    @graph.step("vendor")
+    def _(g):
+        g.track(os.path.join(VENDOR_DIR, VENDOR_MANIFEST))
+        return VendorManifest.load().entries
+
+    @graph.step("images")
+    def _(g):
+        projects, _ = g.get("projects")
+        g.get("vendor")
+        sources = sorted({src for src in [p.image for p in projects] + [ABOUT_IMAGE] if has_source(src)})
+        if not sources:
+            return {}
+        for src in sources:
+            g.track(source_path(src))
+        entries, _ = build_images(sources, os.path.join(out_dir, "images"), workers=workers)
+        for entry in entries.values():
+            for variant in entry.variants:
+                assets.add_existing(f"images/{variant.file}")
+        return entries
+
+    @graph.step("related")
+    def _(g):
+        g.get("projects")
+        for path in sample_paths():
+            g.track(path)
+        g.track(SAMPLES_DIR)
+        return build_related(CATALOG_PATH)
+
+    # Cards are memoized per project and its related projects, so an edit
+    # re-renders only the cards it touched (all of them if card.html changed)
+    cards, card_source = {}, None
+
+    @graph.step("catalog")
+    def _(g):
+        nonlocal cards, card_source
+        projects, filters = g.get("projects")
+        entries, related = g.get("images"), g.get("related")
+        source = (entries, os.stat(g.track(template_path("card.html"))).st_mtime_ns)
+        if card_source is None or source[0] is not card_source[0] or source[1] != card_source[1]:
+            cards, card_source = {}, source
+        images = ImageManifest(entries, "images")
+        by_id = {project.id: project for project in projects}
+        keys = [(p, tuple(by_id[other] for other in related.get(p.id, ()) if other in by_id)) for p in projects]
+        cards = {key: cards.get(key) or render_card(key[0], images, key[1]) for key in keys}
+        return Catalog(projects, filters, images=images, cards=[cards[key] for key in keys])
+
+    @graph.step("site")
+    def _(g):
+        return load_site(g.track(SITE_PATH))
+
+    @graph.step("cv")
+    def _(g):
+        return assets.add(CV_ASSET, build_cv(g.track(CV_PATH)))
+
+    # One step per section, in page order (see sections.render_sections).
+    # Each reads its template, so editing one reruns only that section.
+    section_steps = {
+        "header": lambda g: header_section(g.get("site")),
+        "hero": lambda g: hero_section(g.get("site")),
+        "about": lambda g: about_section(ImageManifest(g.get("images"), "images"), g.get("cv"), g.get("site")),
+        "skills": lambda g: skills_section(g.get("site")),
+        "projects": lambda g: projects_section(g.get("catalog"), g.get("site")),
+        "contact": lambda g: contact_section(g.get("site")),
+        "footer": lambda g: footer_section(g.get("site")),
+    }
+    def section_step(name, build):
+        def run(g):
+            g.track(template_path(f"{name}.html"))
+            return build(g)
+        return run
+
+    for name, build in section_steps.items():
+        graph.step(f"section:{name}")(section_step(name, build))
+
+    @graph.step("icons")
+    def _(g):
+        return inline_icons([(name, g.get(f"section:{name}")) for name in section_steps])
+
+    # Tokens for CSS pruning are collected per fragment (each card, each other
+    # section, the sprite) and reused while the fragment's markup is unchanged
+    tokens = {}
+
+    @graph.step("css")
+    def _(g):
+        sections, sprite, _ = g.get("icons")
+        card_html = g.get("catalog").cards
+        fragments = [sprite, *card_html]
+        for name, html in sections:
+            fragments.append(html.replace("".join(card_html), "", 1) if name == "projects" else html)
+        fresh = {html: tokens.get(html) or stylesheet.markup_tokens(html) for html in fragments}
+        tokens.clear()
+        tokens.update(fresh)
+        critical = [fresh[html] for name, html in sections if name in ("header", "hero")]
+        critical_css, deferred_css = stylesheet.build_tokens(
+            g.track(stylesheet.CSS_PATH), stylesheet.merge_tokens(fresh.values()), stylesheet.merge_tokens(critical),
+        )
+        vendored = VendorManifest(g.get("vendor"))
+        critical_css, deferred_css = (export.vendor_css(css, vendored, assets) for css in (critical_css, deferred_css))
+        return critical_css, assets.add(export.DEFERRED_CSS, deferred_css.encode("utf-8"))
+
+    # Fonts are subset again only when the set of visible characters changes
+    @graph.step("font-text")
+    def _(g):
+        sections, _, _ = g.get("icons")
+        return fonts.page_text("".join(html for _, html in sections))
+
+    @graph.step("fonts")
+    def _(g):
+        for source in fonts.SOURCES:
+            g.track(os.path.join(fonts.SOURCE_DIR, source.file))
+        font_files = fonts.subset_fonts(g.get("font-text"), os.path.join(out_dir, export.FONTS_DIR))
+        for font in font_files:
+            assets.add_existing(f"{export.FONTS_DIR}/{font.file}")
+        return font_files
+
+    @graph.step("script")
+    def _(g):
+        return static_script(g.get("catalog"))
+
+    @graph.step("page")
+    def _(g):
+        sections, sprite, missing_icons = g.get("icons")
+        font_awesome_url = FONT_AWESOME_URL
+        if missing_icons:
+            font_awesome_url = export.vendored_url(VendorManifest(g.get("vendor")), FONT_AWESOME_URL, assets)
+        page = export.assemble_page(
+            sections, sprite, missing_icons, g.get("css"), g.get("fonts"), g.get("script"), font_awesome_url,
+        )
+        path = os.path.join(out_dir, "index.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        assets.save()
+        assets.written += [path, os.path.join(out_dir, MANIFEST_NAME)]
+        return page
+
+    return graph
+
+
+def _stamps(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def rebuild(graph, changed=()):
+    """Run one incremental rebuild, precompress what it wrote; returns (steps run, seconds)."""
+    start = time.perf_counter()
+    graph.assets.written.clear()
+    ran = graph.rebuild(changed)
+    for path in graph.assets.written:
+        export.precompress_file(path)
+    return ran, time.perf_counter() - start
+
+
+def watch(graph, interval=POLL_INTERVAL):
+    """Poll the files the graph has read and rebuild whenever any of them changes."""
+    stamps = _stamps(graph.watched())
+    while True:
+        time.sleep(interval)
+        current = _stamps(stamps)
+        changed = {path for path, stamp in current.items() if stamp != stamps[path]}
+        if not changed:
+            continue
+        names = ", ".join(sorted(os.path.relpath(path) for path in changed))
+        try:
+            ran, elapsed = rebuild(graph, changed)
+        except Exception as exc:  # keep watching; the failed steps stay dirty
+            print(f"{names}: build failed: {exc!r}", flush=True)
+        else:
+            print(f"{names}: rebuilt {', '.join(ran)} in {elapsed * 1000:.1f} ms", flush=True)
+        stamps = {**current, **_stamps(graph.watched() - current.keys())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="dist", help="output directory (default: dist)")
+    parser.add_argument("--workers", type=int, default=None, help="image encoder processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+    graph = site_graph(args.out, args.workers)
+    ran, elapsed = rebuild(graph)
+    print(f"Built {args.out} ({len(ran)} steps) in {elapsed * 1000:.1f} ms; watching {len(graph.watched())} files")
+    try:
+        watch(graph)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()